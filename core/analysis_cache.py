@@ -0,0 +1,108 @@
+"""
+Persistent sentence analysis cache
+Stores the spaCy token and lemma IDs (StringStore hashes) of each sentence
+in SQLite, keyed by sentence content hash and a model/config fingerprint
+"""
+
+import sqlite3
+import hashlib
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Tuple, Optional, Iterable
+
+# (token IDs, lemma IDs) for one lowercased sentence
+Analysis = Tuple[Tuple[int, ...], Tuple[int, ...]]
+
+
+class SentenceAnalysisCache:
+    """On-disk map of (fingerprint, sentence hash) -> token and lemma IDs"""
+
+    SCHEMA_VERSION = 2
+
+    # SQLite limits the number of bound parameters per statement
+    _QUERY_CHUNK = 500
+
+    def __init__(self, db_path: Path, fingerprint: str):
+        self.db_path = Path(db_path)
+        self.fingerprint = hashlib.md5(
+            f"{self.SCHEMA_VERSION}:{fingerprint}".encode()).hexdigest()
+        self.hits = 0
+        self.misses = 0
+
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS analyses ('
+                ' fingerprint TEXT NOT NULL,'
+                ' sentence_hash BLOB NOT NULL,'
+                ' tokens BLOB NOT NULL,'
+                ' lemmas BLOB,'
+                ' PRIMARY KEY (fingerprint, sentence_hash)'
+                ') WITHOUT ROWID'
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection for one operation (safe across threads)"""
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def sentence_hash(text: str) -> bytes:
+        """Content hash of a (lowercased) sentence"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def fetch(self, texts: List[str]) -> List[Optional[Analysis]]:
+        """Look up analyses for texts; None where the sentence is not cached"""
+        hashes = [self.sentence_hash(t) for t in texts]
+        found = {}
+
+        with self._connect() as conn:
+            for start in range(0, len(hashes), self._QUERY_CHUNK):
+                chunk = hashes[start:start + self._QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f'SELECT sentence_hash, tokens, lemmas FROM analyses '
+                    f'WHERE fingerprint = ? AND sentence_hash IN ({placeholders})',
+                    [self.fingerprint, *chunk]
+                )
+                for sentence_hash, tokens, lemmas in rows:
+                    found[sentence_hash] = (self._unpack(tokens), self._unpack(lemmas))
+
+        results = [found.get(h) for h in hashes]
+        hit_count = sum(1 for r in results if r is not None)
+        self.hits += hit_count
+        self.misses += len(results) - hit_count
+        return results
+
+    def store(self, items: Iterable[Tuple[str, Analysis]]):
+        """Persist (text, analysis) pairs"""
+        rows = [
+            (self.fingerprint, self.sentence_hash(text), self._pack(tokens), self._pack(lemmas))
+            for text, (tokens, lemmas) in items
+        ]
+        if not rows:
+            return
+
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?)', rows)
+
+    @staticmethod
+    def _pack(ids: Tuple[int, ...]) -> Optional[bytes]:
+        """Pack 64-bit IDs into a blob (None for an empty sequence)"""
+        return array('Q', ids).tobytes() if ids else None
+
+    @staticmethod
+    def _unpack(blob: Optional[bytes]) -> Tuple[int, ...]:
+        if blob is None:
+            return tuple()
+        ids = array('Q')
+        ids.frombytes(blob)
+        return tuple(ids)
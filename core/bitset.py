@@ -0,0 +1,30 @@
+"""
+Word-coverage bitsets
+A sentence's coverage as one Python int (bit i set = word i covered), so the
+optimizer computes gains with AND + popcount instead of set intersections
+"""
+
+from typing import Iterable, List
+
+
+def to_bitset(indices: Iterable[int]) -> int:
+    """Bitset with the given word indices set"""
+    bits = 0
+    for idx in indices:
+        bits |= 1 << idx
+    return bits
+
+
+def bitset_indices(bits: int) -> List[int]:
+    """Word indices set in a bitset, ascending"""
+    indices = []
+    while bits:
+        lowest = bits & -bits
+        indices.append(lowest.bit_length() - 1)
+        bits ^= lowest
+    return indices
+
+
+def full_bitset(size: int) -> int:
+    """Bitset with words 0..size-1 set"""
+    return (1 << size) - 1
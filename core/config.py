@@ -10,30 +10,47 @@ from typing import List
 class OptimizerConfig:
     """Configuration for the optimization process"""
     # Optimization algorithm
-    algorithm: str = 'weighted_greedy'  # 'greedy' | 'weighted_greedy' | 'beam_search'
+    algorithm: str = 'weighted_greedy'  # 'greedy' | 'weighted_greedy' | 'beam_search' | 'exact' | 'portfolio' | 'grasp'
     
     # Performance settings
     cache_enabled: bool = True
     parallel_processing: bool = True
-    max_workers: int = 4
-    batch_size: int = 50  # For batch processing
+    max_workers: int = 4  # Worker processes for nlp.pipe (n_process), beam search, portfolio and GRASP
+    batch_size: int = 50  # Sentences per nlp.pipe batch
+    stream_chunk_size: int = 10000  # Sentences held in memory by stream_coverage
+    deduplicate_sentences: bool = True  # Analyze/optimize each distinct sentence once
+    incremental_updates: bool = False  # Keep analyses so word edits re-match only affected sentences
+    coverage_format: str = 'set'  # 'set' | 'bitset' (one int per sentence, popcount gains)
+    gain_backend: str = 'python'  # 'python' | 'sparse' (NumPy CSR matrix-vector gains, see core.sparse)
     
     # Algorithm-specific parameters
     beam_width: int = 5  # For beam_search algorithm
-    max_iterations: int = 1000  # Maximum iterations before stopping
+    beam_depth: int = 3  # Beam levels before finishing with greedy
+    exact_time_limit: float = 60.0  # Seconds of branch and bound before returning the best cover found
+    grasp_starts: int = 16  # Randomized greedy + local search runs; start i uses seed grasp_seed + i
+    grasp_seed: int = 0
+    grasp_top_k: int = 3  # Each GRASP pick is uniform among the k largest gains
+    max_iterations: int = 1000  # Maximum iterations (sentence picks) before stopping
+    improve_selection: bool = True  # Reverse delete + k-for-1 swaps after any algorithm (same coverage)
+    reduce_instance: bool = True  # Drop dominated sentences, set aside uncoverable words, force sole covers (full covers only)
     
     # Coverage targets
     max_sentences: int = 600
-    min_coverage_percent: float = 95.0
+    min_coverage_percent: float = 95.0  # Algorithms stop once this share of the word list is covered
+    time_budget: float = 0.0  # Seconds for selection (after matching); 0 = no limit
     progress_interval: int = 10  # Report progress every N iterations
     
     # Matching strictness
     exact_match: bool = False
     lemma_matching: bool = True
-    fuzzy_threshold: float = 0.85
+    matching_mode: str = 'spacy'  # 'spacy' | 'lexicon' (pre-expanded forms, see core.lexicon)
+    fuzzy_matching: bool = False  # Typo/accent-tolerant tier (ignored when exact_match)
+    fuzzy_threshold: float = 0.85  # 1 - edit_distance / length, see core.fuzzy
+    record_match_details: bool = False  # Keep analyses so results can be explained
     
     # SpaCy model
     spacy_model: str = 'fr_core_news_lg'
+    nlp_profile: str = 'full'  # 'full' | 'lemmatizer-only' | 'lookup' (see core.nlp)
     
     # Google Sheets
     spreadsheet_name: str = 'FrenchVocabOptimizer'
@@ -0,0 +1,151 @@
+"""
+Sentence corpus input/output helpers
+Lazy sentence file reading, duplicate removal before analysis and a
+compact on-disk spill format for coverage
+"""
+
+import csv
+import sys
+import struct
+import hashlib
+import unicodedata
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Set, Tuple, Union
+
+SPILL_MAGIC = b'FVOCOV1'
+
+
+def iter_sentences(filepath: Union[str, Path]) -> Iterator[str]:
+    """
+    Yield non-empty sentences from a .csv/.tsv (first column) or text file
+    The file is read lazily, one line at a time
+    """
+    suffix = Path(filepath).suffix.lower()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        if suffix in ('.csv', '.tsv'):
+            delimiter = '\t' if suffix == '.tsv' else ','
+            for row in csv.reader(f, delimiter=delimiter):
+                if row and row[0].strip():
+                    yield row[0].strip()
+        else:
+            for line in f:
+                if line.strip():
+                    yield line.strip()
+
+
+def normalize_sentence(text: str) -> str:
+    """
+    Canonical form used to detect duplicates: case-folded, punctuation
+    removed (apostrophes and hyphens kept), whitespace collapsed
+    """
+    text = unicodedata.normalize('NFC', text).casefold().replace('\u2019', "'")
+    kept = ''.join(
+        c if c in "'-" or not unicodedata.category(c).startswith('P') else ' '
+        for c in text
+    )
+    return ' '.join(kept.split())
+
+
+@dataclass
+class DedupedCorpus:
+    """Unique sentences plus the mapping back to the original rows"""
+    sentences: List[str] = field(default_factory=list)  # First occurrence of each group
+    original_rows: List[List[int]] = field(default_factory=list)  # Rows per unique sentence
+    total_rows: int = 0
+
+    @property
+    def duplicates_removed(self) -> int:
+        return self.total_rows - len(self.sentences)
+
+    def stats(self) -> Dict:
+        """How much analysis/optimization work the dedupe saved"""
+        return {
+            'input_sentences': self.total_rows,
+            'unique_sentences': len(self.sentences),
+            'duplicates_removed': self.duplicates_removed,
+            'saved_percent': round(self.duplicates_removed / self.total_rows * 100, 2)
+            if self.total_rows else 0.0
+        }
+
+
+def deduplicate_sentences(sentences: Iterable[str]) -> DedupedCorpus:
+    """Group exact and whitespace/case/punctuation-variant duplicates"""
+    corpus = DedupedCorpus()
+    seen = {}  # normalized-form digest -> unique index
+
+    for row, sentence in enumerate(sentences):
+        corpus.total_rows += 1
+        key = hashlib.blake2b(normalize_sentence(sentence).encode('utf-8'),
+                              digest_size=16).digest()
+        unique_idx = seen.get(key)
+        if unique_idx is None:
+            seen[key] = len(corpus.sentences)
+            corpus.sentences.append(sentence)
+            corpus.original_rows.append([row])
+        else:
+            corpus.original_rows[unique_idx].append(row)
+
+    return corpus
+
+
+class CoverageSpillWriter:
+    """
+    Append-only coverage file: per sentence a little-endian uint32 word
+    count followed by that many uint32 word indices, in sentence order
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.count = 0
+        self._file = open(self.path, 'wb')
+        self._file.write(SPILL_MAGIC)
+
+    def write(self, coverage: Set[int]):
+        words = array('I', sorted(coverage))
+        if sys.byteorder == 'big':
+            words.byteswap()
+        self._file.write(struct.pack('<I', len(words)))
+        self._file.write(words.tobytes())
+        self.count += 1
+
+    def write_many(self, coverages: Iterable[Set[int]]):
+        for coverage in coverages:
+            self.write(coverage)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CoverageSpill:
+    """Sequential reader for files written by CoverageSpillWriter"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def __iter__(self) -> Iterator[Tuple[int, Set[int]]]:
+        """Yield (sentence_id, coverage) in sentence order"""
+        with open(self.path, 'rb') as f:
+            if f.read(len(SPILL_MAGIC)) != SPILL_MAGIC:
+                raise ValueError(f"Not a coverage spill file: {self.path}")
+
+            sentence_id = 0
+            while True:
+                raw = f.read(4)
+                if len(raw) < 4:
+                    break
+                count = struct.unpack('<I', raw)[0]
+                words = array('I')
+                words.frombytes(f.read(4 * count))
+                if sys.byteorder == 'big':
+                    words.byteswap()
+                yield sentence_id, set(words)
+                sentence_id += 1
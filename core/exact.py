@@ -0,0 +1,316 @@
+"""
+Exact set cover by branch and bound
+Finds the fewest sentences covering every coverable word, or a given number
+of them (partial cover, for coverage targets below 100%). The search starts
+from a known cover (the greedy result), prunes nodes whose lower bound cannot
+beat it, and when the time limit stops it early still proves how far the best
+cover found can be from optimal
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from core.sparse import CoverageMatrix
+
+
+@dataclass
+class CoverSolution:
+    """Best cover found and what the search proved about it"""
+    selected: List[int]  # Matrix row indices
+    lower_bound: int  # No cover uses fewer rows
+    nodes: int
+    optimal: bool
+    time: float
+
+    @property
+    def gap(self) -> int:
+        """Sentences the best cover may have above the optimum"""
+        return len(self.selected) - self.lower_bound
+
+
+def _cheapest_words(u: np.ndarray, mask: np.ndarray, need: Optional[int]) -> np.ndarray:
+    """0/1 mask of the need words in mask with the smallest u (all if need is None)"""
+    words = np.flatnonzero(mask)
+    if need is None or need >= len(words):
+        return mask
+    cheapest = np.zeros_like(mask)
+    if need > 0:
+        cheapest[words[np.argpartition(u[words], need - 1)[:need]]] = 1
+    return cheapest
+
+
+def _subgradient(matrix: CoverageMatrix, uncovered: np.ndarray, usable: np.ndarray,
+                 multipliers: np.ndarray, upper: float, iterations: int = 500,
+                 need: Optional[int] = None, deadline: Optional[float] = None):
+    """
+    Lagrangian bound for covering the uncovered words (or any need of them)
+    with usable rows: for any multipliers u >= 0 on the words, the sum of the
+    need smallest u (all of them for a full cover) plus, over rows,
+    min(0, 1 - u(row)) never exceeds the optimum. Subgradient steps move u
+    towards the LP relaxation's bound until the deadline (a time.time()
+    value). Returns (best bound, its multipliers)
+    """
+    mask = (uncovered > 0).astype(np.float64)
+    u = multipliers * mask
+    best_bound, best_u = -math.inf, u
+    step, stale = 2.0, 0
+
+    for _ in range(iterations):
+        if deadline is not None and time.time() > deadline:
+            break
+        reduced = 1.0 - matrix.dot(u)
+        picked = usable & (reduced < 0)
+        counted = _cheapest_words(u, mask, need)
+        value = float((u * counted).sum() + reduced[picked].sum())
+        if value > best_bound + 1e-9:
+            best_bound, best_u, stale = value, u, 0
+        else:
+            stale += 1
+            if stale == 20:
+                step, stale = step / 2, 0
+        if math.ceil(best_bound - 1e-6) >= upper or step < 1e-3:
+            break
+
+        subgradient = counted - matrix.transpose_dot(picked.astype(np.float64))
+        subgradient[(u <= 0) & (subgradient < 0)] = 0
+        norm = float((subgradient ** 2).sum())
+        if norm == 0:
+            break
+        u = np.maximum(u + step * max(upper - value, 1.0) / norm * subgradient, 0)
+
+    return best_bound, best_u
+
+
+def solve_set_cover(matrix: CoverageMatrix, words: Sequence[int],
+                    incumbent: Optional[Sequence[int]] = None,
+                    time_limit: float = 60.0) -> CoverSolution:
+    """
+    Depth-first branch and bound over the rows of matrix to cover words
+    (words that appear in no row are ignored). Branches on the uncovered word
+    with the fewest usable rows; sibling branches exclude the rows tried
+    before them, so no cover is visited twice.
+
+    Lower bounds: give each uncovered word the weight 1 / (largest number of
+    uncovered words in a usable row containing it). A row's words then weigh
+    at most 1 together, so any cover needs at least the ceiling of the total.
+    These weights seed the root's Lagrangian multipliers (see _subgradient),
+    which every node reuses for a second, usually tighter bound.
+    """
+    start_time = time.time()
+    deadline = start_time + time_limit
+    offsets, column_rows = matrix.column_offsets, matrix.column_rows
+
+    # reduceat needs non-empty segments: only columns with at least one row
+    columns = np.flatnonzero(np.diff(offsets))
+    starts = offsets[:-1][columns]
+
+    target = np.zeros(matrix.n_words, dtype=np.int64)
+    target[list(words)] = 1
+    target[np.diff(offsets) == 0] = 0
+
+    def evaluate(uncovered: np.ndarray, excluded: np.ndarray):
+        """
+        (lower bound, forced rows, branch rows) of a node, or None if some word
+        has no usable row left. Forced rows are the last usable row of some
+        word; branch rows cover the word with the fewest options, lowest
+        reduced cost first
+        """
+        gains = matrix.dot(uncovered)
+        gains[excluded] = 0
+        row_gains = gains[column_rows]
+        usable = row_gains > 0
+        best_gain = np.maximum.reduceat(row_gains, starts)
+        options = np.add.reduceat(usable, starts)
+
+        open_columns = uncovered[columns] > 0
+        best_gain, options = best_gain[open_columns], options[open_columns]
+        if not best_gain.all():
+            return None
+
+        # Lagrangian bound with the root's multipliers (any u >= 0 is valid)
+        u = multipliers * uncovered
+        reduced = 1.0 - matrix.dot(u)
+        lagrangian = float(u.sum() + reduced[(gains > 0) & (reduced < 0)].sum())
+        bound = math.ceil(max(float(np.sum(1.0 / best_gain)), lagrangian) - 1e-6)
+
+        forced = []
+        if (options == 1).any():
+            last_usable = np.maximum.reduceat(np.where(usable, column_rows, -1), starts)
+            forced = np.unique(last_usable[open_columns][options == 1]).tolist()
+
+        word = columns[open_columns][np.argmin(options)]
+        rows = column_rows[offsets[word]:offsets[word + 1]]
+        rows = rows[gains[rows] > 0]
+        return bound, forced, rows[np.lexsort((rows, -gains[rows], reduced[rows]))]
+
+    best = list(incumbent) if incumbent is not None else None
+    best_size = len(best) if best is not None else math.inf
+    nodes = 0
+
+    # Frames: [chosen rows, uncovered mask, excluded rows, bound, branch rows, next branch]
+    stack = []
+
+    def visit(chosen: List[int], uncovered: np.ndarray, excluded: np.ndarray):
+        nonlocal best, best_size, nodes
+        nodes += 1
+        while True:
+            if not uncovered.any():
+                if len(chosen) < best_size:
+                    best, best_size = chosen, len(chosen)
+                return
+            node = evaluate(uncovered, excluded)
+            if node is None or len(chosen) + max(node[0], len(node[1])) >= best_size:
+                return
+            bound, forced, rows = node
+            if not forced:
+                break
+            # Rows that are some word's last option belong to every completion
+            uncovered = uncovered.copy()
+            for row in forced:
+                uncovered[matrix.indices[matrix.offsets[row]:matrix.offsets[row + 1]]] = 0
+            chosen = chosen + forced
+        stack.append([chosen, uncovered, excluded, len(chosen) + bound, rows, 0])
+
+    # Root multipliers: start from the weight bound, then subgradient steps
+    multipliers = np.zeros(matrix.n_words, dtype=np.float64)
+    gains = matrix.dot(target)
+    row_gains = gains[column_rows]
+    multipliers[columns] = 1.0 / np.maximum(np.maximum.reduceat(row_gains, starts), 1)
+    upper = best_size if best is not None else float(target.sum())
+    lagrangian, multipliers = _subgradient(matrix, target, gains > 0, multipliers, upper,
+                                           deadline=deadline)
+
+    # Reduced-cost fixing: a row whose reduced cost lifts the bound to the
+    # incumbent's size cannot be part of a smaller cover
+    reduced = 1.0 - matrix.dot(multipliers)
+    fixed = np.flatnonzero((gains > 0) & (np.ceil(lagrangian + reduced - 1e-6) >= best_size))
+
+    visit([], target, fixed)
+    root_bound = stack[0][3] if stack else best_size
+
+    timed_out = False
+    while stack:
+        if time.time() > deadline:
+            timed_out = True
+            break
+        frame = stack[-1]
+        chosen, uncovered, excluded, bound, rows, position = frame
+        if position == len(rows) or bound >= best_size:
+            stack.pop()
+            continue
+        frame[5] += 1
+
+        row = rows[position]
+        child = uncovered.copy()
+        child[matrix.indices[matrix.offsets[row]:matrix.offsets[row + 1]]] = 0
+        visit(chosen + [int(row)], child, np.concatenate((excluded, rows[:position])))
+
+    if best is None:
+        raise ValueError("No cover exists for the given words")
+
+    # Finished: the incumbent is optimal; stopped early: the root bound holds
+    lower_bound = root_bound if timed_out else best_size
+
+    return CoverSolution(
+        selected=best,
+        lower_bound=int(lower_bound),
+        nodes=nodes,
+        optimal=lower_bound == best_size,
+        time=time.time() - start_time
+    )
+
+
+def solve_partial_cover(matrix: CoverageMatrix, words: Sequence[int], need: int,
+                        incumbent: Optional[Sequence[int]] = None,
+                        time_limit: float = 60.0) -> CoverSolution:
+    """
+    Depth-first branch and bound for the fewest rows of matrix covering at
+    least need of the given words. Branches on the row with the largest gain:
+    first with it, then without it for the rest of that subtree.
+
+    Lower bounds: the fewest remaining rows whose gains add up to the words
+    still needed, and the Lagrangian bound of _subgradient with the root's
+    multipliers, counting only the cheapest needed words.
+    """
+    start_time = time.time()
+    deadline = start_time + time_limit
+    n_rows = len(matrix)
+
+    target = np.zeros(matrix.n_words, dtype=np.int64)
+    target[list(words)] = 1
+    target[np.diff(matrix.column_offsets) == 0] = 0
+
+    def evaluate(uncovered: np.ndarray, excluded: np.ndarray, needed: int):
+        """(lower bound, row gains) of a node, or None if it cannot reach need"""
+        gains = matrix.dot(uncovered)
+        gains[excluded] = 0
+        ranked = np.cumsum(np.sort(gains)[::-1])
+        if not len(ranked) or ranked[-1] < needed:
+            return None
+        by_gains = int(np.searchsorted(ranked, needed)) + 1
+
+        u = multipliers * uncovered
+        reduced = 1.0 - matrix.dot(u)
+        reachable = (uncovered > 0) & (matrix.transpose_dot((gains > 0).astype(np.int64)) > 0)
+        counted = _cheapest_words(u, reachable.astype(np.float64), needed)
+        lagrangian = float((u * counted).sum() + reduced[(gains > 0) & (reduced < 0)].sum())
+        return math.ceil(max(by_gains, lagrangian) - 1e-6), gains
+
+    best = list(incumbent) if incumbent is not None else None
+    best_size = len(best) if best is not None else math.inf
+    nodes = 0
+
+    # Root multipliers: uniform weights, then subgradient steps
+    gains = matrix.dot(target)
+    multipliers = target / max(int(gains.max(initial=0)), 1)
+    upper = best_size if best is not None else float(need)
+    _, multipliers = _subgradient(matrix, target, gains > 0, multipliers, upper,
+                                  need=need, deadline=deadline)
+
+    # Nodes: (chosen rows, uncovered mask, excluded rows, words still needed)
+    stack = [([], target, np.zeros(n_rows, dtype=bool), need)]
+    root = evaluate(target, stack[0][2], need) if need > 0 else (0, None)
+    root_bound = root[0] if root is not None else best_size
+    timed_out = False
+    while stack:
+        if time.time() > deadline:
+            timed_out = True
+            break
+        chosen, uncovered, excluded, needed = stack.pop()
+        nodes += 1
+        if needed <= 0:
+            if len(chosen) < best_size:
+                best, best_size = chosen, len(chosen)
+            continue
+
+        node = evaluate(uncovered, excluded, needed)
+        if node is None or len(chosen) + node[0] >= best_size:
+            continue
+        gains = node[1]
+
+        # Without the row goes on the stack first, so the branch with it runs first
+        row = int(np.argmax(gains))
+        without = excluded.copy()
+        without[row] = True
+        stack.append((chosen, uncovered, without, needed))
+        child = uncovered.copy()
+        child[matrix.indices[matrix.offsets[row]:matrix.offsets[row + 1]]] = 0
+        stack.append((chosen + [row], child, excluded, needed - int(gains[row])))
+
+    if best is None:
+        raise ValueError("No partial cover reaches the needed number of words")
+
+    # Finished: the incumbent is optimal; stopped early: the root bound holds
+    lower_bound = min(root_bound, best_size) if timed_out else best_size
+
+    return CoverSolution(
+        selected=best,
+        lower_bound=int(lower_bound),
+        nodes=nodes,
+        optimal=lower_bound == best_size,
+        time=time.time() - start_time
+    )
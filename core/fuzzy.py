@@ -0,0 +1,129 @@
+"""
+Fuzzy word lookup for misspellings and accent-less corpora
+Candidates come from a character trigram index, so a query is only compared
+against vocabulary terms that share enough trigrams with it
+"""
+
+import math
+import unicodedata
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Characters that do not decompose under NFKD
+_LIGATURES = str.maketrans({'œ': 'oe', 'æ': 'ae'})
+
+_PAD = '\x00' * 2  # q - 1 padding characters for q = 3
+
+
+def fold_accents(text: str) -> str:
+    """Lowercase and strip diacritics ("Élève" -> "eleve")"""
+    decomposed = unicodedata.normalize('NFKD', text.lower().translate(_LIGATURES))
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _trigrams(text: str) -> List[Tuple[str, int]]:
+    """Padded trigrams, numbered per occurrence so set overlap equals multiset overlap"""
+    padded = _PAD + text + _PAD
+    seen = {}
+    grams = []
+    for i in range(len(padded) - 2):
+        gram = padded[i:i + 3]
+        seen[gram] = seen.get(gram, 0) + 1
+        grams.append((gram, seen[gram]))
+    return grams
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions), or max_distance + 1 once it is exceeded
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    before_previous = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(previous[j] + 1,
+                             current[j - 1] + 1,
+                             previous[j - 1] + (char_a != char_b))
+            if (before_previous is not None and j > 1
+                    and char_a == b[j - 2] and a[i - 2] == char_b):
+                current[j] = min(current[j], before_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        before_previous, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """
+    Accent-insensitive, typo-tolerant lookup of vocabulary terms
+    Similarity is 1 - edit_distance / max(len), where adjacent transpositions
+    count as one edit: a threshold of 0.85 allows
+    one edit from 7 characters, two from 14. Accent folding alone never
+    costs an edit.
+    """
+
+    def __init__(self, terms: Dict[str, Iterable[int]], threshold: float = 0.85,
+                 min_length: int = 4):
+        self.threshold = threshold
+        self.min_length = min_length
+
+        self.terms: List[str] = []
+        self.term_words: List[Set[int]] = []
+        self.folded_lookup: Dict[str, int] = {}
+        self.trigram_index: Dict[Tuple[str, int], List[int]] = {}
+
+        for term, word_indices in terms.items():
+            folded = fold_accents(term)
+            if len(folded) < min_length:
+                continue
+
+            term_id = self.folded_lookup.get(folded)
+            if term_id is None:
+                term_id = len(self.terms)
+                self.folded_lookup[folded] = term_id
+                self.terms.append(folded)
+                self.term_words.append(set())
+                for gram in _trigrams(folded):
+                    self.trigram_index.setdefault(gram, []).append(term_id)
+            self.term_words[term_id].update(word_indices)
+
+    def _max_distance(self, length: int) -> int:
+        return math.floor((1 - self.threshold) * length + 1e-9)
+
+    def lookup(self, text: str) -> Set[int]:
+        """Word indices of vocabulary terms similar to text"""
+        folded = fold_accents(text)
+        if len(folded) < self.min_length:
+            return set()
+
+        # Accent-insensitive exact hit
+        term_id = self.folded_lookup.get(folded)
+        if term_id is not None:
+            return set(self.term_words[term_id])
+
+        # Longest candidate that could still pass: max_len <= len / threshold
+        length = len(folded)
+        if self.threshold <= 0 or self._max_distance(length / self.threshold) == 0:
+            return set()
+
+        shared = {}
+        for gram in _trigrams(folded):
+            for candidate in self.trigram_index.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        found = set()
+        for candidate, count in shared.items():
+            term = self.terms[candidate]
+            longest = max(length, len(term))
+            k = self._max_distance(longest)
+            # q-gram filter: each edit (a transposition included) destroys at
+            # most q + 1 = 4 of the max_len + q - 1 padded grams
+            if k == 0 or count < longest + 2 - 4 * k:
+                continue
+            if bounded_edit_distance(folded, term, k) <= k:
+                found.update(self.term_words[candidate])
+        return found
@@ -0,0 +1,123 @@
+"""
+Inflection lexicon for spaCy-free matching
+Expands dictionary forms into every inflected surface form listed in spaCy's
+French lemma tables (spacy-lookups-data), so sentences only need a regex
+tokenizer and hash lookups at match time
+"""
+
+import re
+import threading
+from importlib.metadata import PackageNotFoundError, version
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from spacy.lookups import load_lookups
+from spacy.strings import hash_string
+
+# Words with optional hyphenated parts; elided words keep their apostrophe
+# ("l'élève" -> "l'", "élève"), like spaCy's French tokenizer
+TOKEN_PATTERN = re.compile(r"\w+(?:-\w+)*'?")
+
+_APOSTROPHES = str.maketrans({'’': "'", 'ʼ': "'"})
+
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+
+def _normalize(text: str) -> str:
+    """Unify typographic apostrophes (keeps character offsets)"""
+    return text.translate(_APOSTROPHES) if '’' in text or 'ʼ' in text else text
+
+
+def split_words(text: str, keep_compound: Optional[Callable[[str], bool]] = None
+                ) -> List[str]:
+    """
+    Split lowercased text into tokens
+    Hyphenated words are split into their parts ("vas-tu" -> "vas", "tu")
+    unless keep_compound(word) is true; by default they are kept whole.
+    """
+    words = TOKEN_PATTERN.findall(_normalize(text))
+    if keep_compound is None or '-' not in text:
+        return words
+
+    tokens = []
+    for word in words:
+        if '-' not in word or keep_compound(word):
+            tokens.append(word)
+        else:
+            tokens.extend(word.split('-'))
+    return tokens
+
+
+def tokenize(text: str, keep_compound: Optional[Callable[[str], bool]] = None
+             ) -> List[Tuple[str, int]]:
+    """Same tokens as split_words, as (token, start offset) pairs"""
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(_normalize(text)):
+        token = match.group()
+        if '-' not in token or keep_compound is None or keep_compound(token):
+            tokens.append((token, match.start()))
+            continue
+        offset = match.start()
+        for part in token.split('-'):
+            tokens.append((part, offset))
+            offset += len(part) + 1
+    return tokens
+
+
+class InflectionLexicon:
+    """Two-way map between surface forms and lemmas"""
+
+    def __init__(self, form_lemmas: Dict[int, List[str]], exceptions: Dict[str, List[str]]):
+        # form hash -> lemmas; POS-specific exceptions cover irregular forms
+        # missing from the lookup table ("suis", "aux")
+        self.form_lemmas = dict(form_lemmas)
+        for form, lemmas in exceptions.items():
+            known = self.form_lemmas.setdefault(hash_string(form), [])
+            known.extend(lemma for lemma in lemmas if lemma not in known)
+
+        self.lemma_forms: Dict[str, Set[int]] = {}  # lemma -> form hashes
+        for form, lemmas in self.form_lemmas.items():
+            for lemma in lemmas:
+                self.lemma_forms.setdefault(lemma, set()).add(form)
+
+    def lemmas_of(self, form: str) -> List[str]:
+        """Lemmas of a surface form (empty if unknown)"""
+        return self.form_lemmas.get(hash_string(form), [])
+
+    def expand(self, word: str) -> Set[int]:
+        """
+        Hashes of every surface form of word, word itself included
+        A dictionary form expands to its own inflections; an inflected
+        vocabulary entry ("mangé") expands through its lemmas.
+        """
+        forms = {hash_string(word)}
+        if word in self.lemma_forms:
+            forms.update(self.lemma_forms[word])
+        else:
+            for lemma in self.lemmas_of(word):
+                forms.update(self.lemma_forms.get(lemma, ()))
+        return forms
+
+
+def load_lexicon() -> InflectionLexicon:
+    """
+    Shared French lexicon, built on first use (needs spacy-lookups-data)
+    Raises ValueError if the lookup tables are not installed.
+    """
+    global _lexicon
+    with _lexicon_lock:
+        if _lexicon is None:
+            lookups = load_lookups('fr', ['lemma_lookup', 'lemma_exc'])
+            exceptions = {}
+            for pos_table in lookups.get_table('lemma_exc').values():
+                for form, lemmas in pos_table.items():
+                    exceptions.setdefault(form, []).extend(lemmas)
+            _lexicon = InflectionLexicon(lookups.get_table('lemma_lookup'), exceptions)
+    return _lexicon
+
+
+def lexicon_version() -> str:
+    """Installed spacy-lookups-data version (part of the word cache key)"""
+    try:
+        return version('spacy-lookups-data')
+    except PackageNotFoundError:
+        return ''
@@ -0,0 +1,126 @@
+"""
+Selection improvement: reverse delete and k-for-1 swaps
+Both moves work on per-word cover counts (how many selected sentences contain
+each word), so checking a move costs time proportional to the word counts of
+the sentences involved, not to the size of the selection or the corpus
+"""
+
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+
+def improve_cover(selected: Sequence[int], words_of: Callable[[int], Sequence[int]],
+                  coverage_map: Dict[int, List[int]], n_words: int,
+                  deadline: Optional[float] = None) -> Tuple[List[int], Dict]:
+    """
+    Smaller selection covering exactly the same words, and move statistics.
+
+    Reverse delete drops sentences whose words are all covered by other picks,
+    latest picks first. A swap adds one unselected sentence that contains every
+    word only covered by each of two or more selected sentences, then removes
+    those that became redundant; it is kept only if at least two go. Swaps
+    stop at the deadline (a time.time() value), if one is given.
+    """
+    cache = {}
+
+    def words(sent_idx: int) -> Sequence[int]:
+        if sent_idx not in cache:
+            cache[sent_idx] = words_of(sent_idx)
+        return cache[sent_idx]
+
+    counts = [0] * n_words
+    for sent_idx in selected:
+        for word_idx in words(sent_idx):
+            counts[word_idx] += 1
+
+    # Reverse delete
+    kept = []
+    for sent_idx in reversed(selected):
+        sent_words = words(sent_idx)
+        if all(counts[w] > 1 for w in sent_words):
+            for w in sent_words:
+                counts[w] -= 1
+        else:
+            kept.append(sent_idx)
+    kept.reverse()
+    redundant = len(selected) - len(kept)
+
+    # k-for-1 swaps, until a pass over the candidates finds none
+    chosen = set(kept)
+    swaps = removed_by_swaps = 0
+    while True:
+        owner, owned = _owners(chosen, words, counts)
+        candidates = _candidates(owner, coverage_map, chosen)
+        swapped = False
+
+        for candidate in candidates:
+            if deadline is not None and time.time() >= deadline:
+                break
+            if candidate in chosen:
+                continue
+            # Selected sentences whose only-covered words are all in the candidate
+            tally = Counter(owner[w] for w in words(candidate) if w in owner)
+            removable = sorted(s for s, n in tally.items() if n == owned[s] and s in chosen)
+            if len(removable) < 2:
+                continue
+
+            for w in words(candidate):
+                counts[w] += 1
+            out = []
+            for sent_idx in removable:
+                sent_words = words(sent_idx)
+                if all(counts[w] > 1 for w in sent_words):
+                    for w in sent_words:
+                        counts[w] -= 1
+                    out.append(sent_idx)
+
+            if len(out) >= 2:
+                chosen.add(candidate)
+                chosen.difference_update(out)
+                swaps += 1
+                removed_by_swaps += len(out)
+                swapped = True
+                owner, owned = _owners(chosen, words, counts)
+            else:
+                for sent_idx in out:
+                    for w in words(sent_idx):
+                        counts[w] += 1
+                for w in words(candidate):
+                    counts[w] -= 1
+
+        if not swapped:
+            break
+
+    improved = [s for s in kept if s in chosen] + sorted(chosen.difference(kept))
+    return improved, {
+        'redundant_removed': redundant,
+        'swaps': swaps,
+        'swap_savings': removed_by_swaps - swaps
+    }
+
+
+def _owners(chosen: Set[int], words: Callable[[int], Sequence[int]],
+            counts: List[int]) -> Tuple[Dict[int, int], Counter]:
+    """Words covered by a single selected sentence -> that sentence, and words per owner"""
+    owner = {}
+    for sent_idx in chosen:
+        for w in words(sent_idx):
+            if counts[w] == 1:
+                owner[w] = sent_idx
+    return owner, Counter(owner.values())
+
+
+def _candidates(owner: Dict[int, int], coverage_map: Dict[int, List[int]],
+                chosen: Set[int]) -> List[int]:
+    """
+    Unselected sentences that could replace two or more selected ones. To make
+    a sentence redundant a candidate must contain its rarest only-covered
+    word, so it has to appear in at least two owners' rarest-word lists
+    """
+    rarest = {}
+    for w, sent_idx in owner.items():
+        if sent_idx not in rarest or len(coverage_map[w]) < len(coverage_map[rarest[sent_idx]]):
+            rarest[sent_idx] = w
+    hits = Counter(c for w in rarest.values() for c in coverage_map[w] if c not in chosen)
+    return sorted(c for c, n in hits.items() if n >= 2)
@@ -3,63 +3,304 @@ Enhanced Word Matcher with caching and optimization
 Handles gender variations, conjugations, multi-word phrases with improved performance
 """
 
-import re
+import json
+import time
 import spacy
-import pickle
 import hashlib
+from array import array
+from itertools import islice, product
 from pathlib import Path
-from typing import List, Set, Dict, Tuple, Optional
+from typing import List, Set, Dict, Tuple, Optional, Callable, Iterable, Iterator, Sequence, Union
 from functools import lru_cache
-from concurrent.futures import ThreadPoolExecutor
+from spacy.strings import StringStore, hash_string
 from core.config import OptimizerConfig
+from core.analysis_cache import SentenceAnalysisCache, Analysis
+from core.nlp import get_pipeline
+from core.fuzzy import FuzzyIndex
+from core.word_cache import WordListCache, flatten_trie, unflatten_trie
+from core.corpus import CoverageSpillWriter
+from core.lexicon import split_words, tokenize, load_lexicon, lexicon_version
+from core.bitset import to_bitset, bitset_indices
+
+
+class IntPostings:
+    """
+    Read-only map of interned string ID -> word indices, stored CSR-style
+    Row r's word indices are indices[offsets[r]:offsets[r + 1]]
+    """
+    
+    def __init__(self, postings: Dict[int, Iterable[int]]):
+        self.rows = {}
+        self.offsets = array('q', [0])
+        self.indices = array('i')
+        
+        for key, word_indices in postings.items():
+            self.rows[key] = len(self.rows)
+            self.indices.extend(sorted(word_indices))
+            self.offsets.append(len(self.indices))
+    
+    @classmethod
+    def from_arrays(cls, keys: array, offsets: array, indices: array) -> 'IntPostings':
+        """Rebuild from the arrays returned by to_arrays"""
+        postings = cls({})
+        postings.rows = dict(zip(keys, range(len(keys))))
+        postings.offsets = offsets
+        postings.indices = indices
+        return postings
+    
+    def to_arrays(self) -> Tuple[array, array, array]:
+        """(keys in row order, offsets, indices)"""
+        return array('Q', self.rows), self.offsets, self.indices
+    
+    def updated(self, mapping: Optional[Sequence[int]] = None,
+                additions: Optional[Dict[int, Iterable[int]]] = None) -> 'IntPostings':
+        """
+        Copy with word indices renumbered through mapping (old -> new index,
+        -1 drops the word) and additions merged in; emptied rows are dropped
+        """
+        additions = additions or {}
+        postings = IntPostings({})
+        rows, offsets, indices = postings.rows, postings.offsets, postings.indices
+        
+        for key, row in self.rows.items():
+            word_indices = self.indices[self.offsets[row]:self.offsets[row + 1]]
+            if mapping is not None:
+                word_indices = sorted(mapping[i] for i in word_indices if mapping[i] >= 0)
+            if key in additions:
+                word_indices = sorted(set(word_indices).union(additions[key]))
+            if len(word_indices):
+                rows[key] = len(rows)
+                indices.extend(word_indices)
+                offsets.append(len(indices))
+        
+        for key, word_indices in additions.items():
+            if key not in self.rows:
+                rows[key] = len(rows)
+                indices.extend(sorted(word_indices))
+                offsets.append(len(indices))
+        
+        return postings
+    
+    def get(self, key: int) -> Sequence[int]:
+        """Word indices for key (empty if unknown)"""
+        row = self.rows.get(key)
+        if row is None:
+            return ()
+        return self.indices[self.offsets[row]:self.offsets[row + 1]]
+    
+    def __getitem__(self, key: int) -> Sequence[int]:
+        row = self.rows[key]
+        return self.indices[self.offsets[row]:self.offsets[row + 1]]
+    
+    def __contains__(self, key: int) -> bool:
+        return key in self.rows
+    
+    def __len__(self) -> int:
+        return len(self.rows)
 
 
 class EnhancedWordMatcher:
     """Optimized word matcher with caching and parallel processing"""
     
+    # Minimum number of texts before nlp.pipe fans out to worker processes;
+    # starting the workers costs seconds, while one process pipes ~1-5k texts/s
+    PARALLEL_THRESHOLD = 10000
+    
+    # Bump when the preprocessed word format changes to invalidate old caches
+    CACHE_VERSION = 3
+    
+    # Keys added to each word entry by _preprocess_words (not part of the cache key)
+    DERIVED_FIELDS = ('variations', 'is_phrase', 'lemmas', 'tokens', 'sequences', 'index')
+    
+    # Sentences looked up in / written to the analysis cache per round trip
+    ANALYSIS_CACHE_CHUNK = 1000
+    
+    # Distinct sentence tokens remembered by the fuzzy tier before resetting
+    FUZZY_MEMO_SIZE = 200000
+    
+    # Most recent word caches tried as a base when the word list has changed
+    RELATED_CACHE_CANDIDATES = 3
+    
+    # 'spacy' analyzes every sentence with the pipeline; 'lexicon' expands the
+    # word list into all inflected forms once and only tokenizes sentences
+    MATCHING_MODES = ('spacy', 'lexicon')
+    
+    # Most expanded surface sequences one phrase may add to the trie in
+    # lexicon mode (beyond it only the dictionary form is matched)
+    PHRASE_EXPANSION_LIMIT = 256
+    
     def __init__(self, word_list: List[Dict], config: OptimizerConfig = None):
         self.word_list = word_list
         self.config = config or OptimizerConfig()
+        if self.config.matching_mode not in self.MATCHING_MODES:
+            raise ValueError(f"Unknown matching mode: {self.config.matching_mode} "
+                             f"(choose from {', '.join(self.MATCHING_MODES)})")
+        self.lexicon_mode = self.config.matching_mode == 'lexicon'
         self.nlp = None
+        self.fuzzy_index = None
+        self.strings = None  # StringStore resolving token IDs back to text
+        self.preprocess_time = 0.0  # Cold-start word preprocessing time (0 when cached)
+        self._recorded_analyses = None  # (sentences, analyses) of the last recorded batch
         self.cache_dir = Path(self.config.cache_folder)
         self.cache_dir.mkdir(exist_ok=True)
         
         self._load_spacy_model()
-        self._preprocess_words()
-        self._build_lookup_tables()
+        if not self._load_word_cache():
+            self._preprocess_words()
+            self._build_lookup_tables()
+            self._save_word_cache()
+        self._build_fuzzy_index()
+        
+        # Persistent per-sentence analyses (skips spaCy on re-runs; lexicon
+        # mode tokenizes faster than a cache lookup)
+        self.analysis_cache = None
+        if self.config.cache_enabled and not self.lexicon_mode:
+            self.analysis_cache = SentenceAnalysisCache(
+                self.cache_dir / 'sentence_analysis.sqlite', self._analysis_fingerprint())
     
     def _load_spacy_model(self):
-        """Load French spaCy model with optimizations"""
+        """Get the shared French spaCy model for the configured pipeline profile"""
+        if self.lexicon_mode:
+            # No model: sentences are tokenized by core.lexicon.split_words
+            self.strings = StringStore()
+            self.model_stats = {'profile': None, 'model': None, 'pipes': [],
+                                'load_time': 0.0, 'memory_mb': None, 'shared': False}
+            print("✓ Lexicon matching mode: no spaCy model needed")
+            return
+        
         try:
-            print(f"Loading spaCy model: {self.config.spacy_model}...")
-            self.nlp = spacy.load(self.config.spacy_model)
-            
-            # Disable unnecessary pipeline components for speed
-            disable = ['parser', 'ner'] if self.config.lemma_matching else ['lemmatizer', 'parser', 'ner']
-            for component in disable:
-                if component in self.nlp.pipe_names:
-                    self.nlp.disable_pipe(component)
+            self.nlp, self.model_stats = get_pipeline(
+                self.config.spacy_model, self.config.nlp_profile, self.config.lemma_matching)
             
-            print(f"✓ spaCy model loaded (Active pipes: {self.nlp.pipe_names})")
+            if self.model_stats['shared']:
+                print(f"✓ Using shared spaCy model: {self.config.spacy_model} "
+                      f"(profile: {self.config.nlp_profile})")
+            else:
+                memory = self.model_stats['memory_mb']
+                print(f"✓ spaCy model loaded in {self.model_stats['load_time']}s"
+                      f"{f', {memory:+} MB' if memory is not None else ''} "
+                      f"(Active pipes: {self.nlp.pipe_names})")
+            self.strings = self.nlp.vocab.strings
         except OSError:
             print(f"ERROR: spaCy model '{self.config.spacy_model}' not found!")
             print(f"Install with: python -m spacy download {self.config.spacy_model}")
             raise
+        except ValueError:
+            if self.config.nlp_profile == 'lookup':
+                print("ERROR: lookup lemmas require the spacy-lookups-data package")
+                print("Install with: pip install spacy-lookups-data")
+            raise
     
-    def _preprocess_words(self):
-        """Enhanced preprocessing with caching"""
-        cache_file = self.cache_dir / self._get_word_list_hash()
+    def _load_word_cache(self) -> bool:
+        """Restore preprocessed words and lookup tables from cache (warm start)"""
+        if not self.config.cache_enabled:
+            return False
+        
+        cached = WordListCache(self.cache_dir / self._get_word_list_hash()).load()
+        if cached is None:
+            return self._load_related_word_cache()
+        
+        print("Loading preprocessed words and lookup tables from cache...")
+        self.word_list, arrays, meta = cached
+        self._restore_tables(arrays, meta)
+        print(f"✓ Loaded {len(self.word_list)} words from cache "
+              f"({len(self.lemma_to_word_idx)} lemmas, {len(self.token_to_word_idx)} tokens, "
+              f"{self.phrase_count} phrase forms)")
+        return True
+    
+    def _load_related_word_cache(self) -> bool:
+        """
+        Warm start from the cache of an earlier version of this word list
+        The most recent caches built with the same cache version and model
+        settings are diffed against the current list; only words missing from
+        them are preprocessed.
+        """
+        fingerprint = self._model_fingerprint()
+        candidates = sorted(self.cache_dir.glob('*.wlc'),
+                            key=lambda path: path.stat().st_mtime, reverse=True)
+        
+        tried = 0
+        for path in candidates:
+            if tried == self.RELATED_CACHE_CANDIDATES:
+                break
+            cached = WordListCache(path).load()
+            if (cached is None or cached[2].get('version') != self.CACHE_VERSION
+                    or cached[2].get('model') != fingerprint):
+                continue
+            tried += 1
+            old_words, arrays, meta = cached
+            
+            # Pair each current word with an identical cached entry
+            positions = {}
+            for old_idx, word_data in enumerate(old_words):
+                positions.setdefault(self._word_key(word_data), []).append(old_idx)
+            
+            mapping = [-1] * len(old_words)  # Cached index -> current index
+            word_list, fresh = [], []
+            for idx, word_data in enumerate(self.word_list):
+                matches = positions.get(self._word_key(word_data))
+                if matches:
+                    old_idx = matches.pop(0)
+                    mapping[old_idx] = idx
+                    word_list.append(old_words[old_idx])
+                else:
+                    word_list.append(word_data)
+                    fresh.append(idx)
+            
+            if len(fresh) == len(word_list):
+                continue  # Nothing in common
+            
+            self.word_list = old_words
+            self._restore_tables(arrays, meta)
+            self._rebase_words(word_list, mapping, fresh)
+            removed = sum(1 for idx in mapping if idx < 0)
+            print(f"✓ Updated cached word list {path.name}: {len(word_list) - len(fresh)} kept, "
+                  f"{len(fresh)} added, {removed} removed")
+            return True
         
-        if self.config.cache_enabled and cache_file.exists():
-            print("Loading preprocessed words from cache...")
-            with open(cache_file, 'rb') as f:
-                self.word_list = pickle.load(f)
-            print(f"✓ Loaded {len(self.word_list)} words from cache")
+        return False
+    
+    def _restore_tables(self, arrays: Dict[str, array], meta: Dict):
+        """Rebuild lookup tables from cached arrays"""
+        self.token_to_word_idx = IntPostings.from_arrays(
+            arrays['token_keys'], arrays['token_offsets'], arrays['token_indices'])
+        self.lemma_to_word_idx = IntPostings.from_arrays(
+            arrays['lemma_keys'], arrays['lemma_offsets'], arrays['lemma_indices'])
+        self.phrase_trie = unflatten_trie(arrays)
+        self.phrase_count = meta['phrase_count']
+    
+    def _save_word_cache(self):
+        """Persist preprocessed words and lookup tables"""
+        if not self.config.cache_enabled:
             return
         
+        arrays = flatten_trie(self.phrase_trie)
+        for name, postings in (('token', self.token_to_word_idx), ('lemma', self.lemma_to_word_idx)):
+            keys, offsets, indices = postings.to_arrays()
+            arrays.update({f'{name}_keys': keys, f'{name}_offsets': offsets,
+                           f'{name}_indices': indices})
+        
+        WordListCache(self.cache_dir / self._get_word_list_hash()).save(
+            self.word_list, arrays,
+            {'phrase_count': self.phrase_count, 'version': self.CACHE_VERSION,
+             'model': self._model_fingerprint()})
+        print(f"✓ Saved preprocessed words to cache")
+    
+    def _preprocess_words(self, indices: Optional[Iterable[int]] = None):
+        """
+        Split variations and collect tokens, lemmas and phrase sequences
+        All distinct variations go through one batched (optionally
+        multi-process) nlp.pipe call and are scattered back to their words.
+        In lexicon mode they are only tokenized; inflected forms are added
+        when the lookup tables are built. indices limits the work to some
+        words (incremental updates); by default the whole list is processed.
+        """
         print("Preprocessing word list...")
+        start_time = time.perf_counter()
+        indices = range(len(self.word_list)) if indices is None else list(indices)
+        words = [self.word_list[idx] for idx in indices]
         
-        for idx, word_data in enumerate(self.word_list):
+        for idx, word_data in zip(indices, words):
             french = word_data['french']
             
             # Handle gender variations (Un|Une, le|la)
@@ -71,65 +312,145 @@ class EnhancedWordMatcher:
             # Multi-word phrase detection
             word_data['is_phrase'] = any(' ' in v for v in word_data['variations'])
             
-            # Get lemmas for each variation
-            word_data['lemmas'] = set()
-            word_data['tokens'] = set()
-            
-            for variation in word_data['variations']:
-                doc = self.nlp(variation.lower())
-                for token in doc:
-                    word_data['tokens'].add(token.text)
-                    if self.config.lemma_matching:
-                        word_data['lemmas'].add(token.lemma_)
-            
             # Store index
             word_data['index'] = idx
-            
-            if (idx + 1) % 500 == 0:
-                print(f"  Processed {idx + 1}/{len(self.word_list)} words...")
         
-        # Save to cache
-        if self.config.cache_enabled:
-            with open(cache_file, 'wb') as f:
-                pickle.dump(self.word_list, f)
-            print(f"✓ Saved preprocessed words to cache")
+        # Analyze each distinct variation once
+        texts = list(dict.fromkeys(
+            v.lower() for word_data in words for v in word_data['variations']))
+        
+        n_process = 1
+        if (self.config.parallel_processing and not self.lexicon_mode
+                and len(texts) >= self.PARALLEL_THRESHOLD):
+            n_process = max(1, self.config.max_workers)
+        
+        analyzed = {}  # variation -> (token texts, lemma texts)
+        if self.lexicon_mode:
+            for text in texts:
+                analyzed[text] = (tuple(split_words(text)), tuple())
+        else:
+            docs = self.nlp.pipe(texts, batch_size=max(1, self.config.batch_size),
+                                 n_process=n_process)
+            for count, (text, doc) in enumerate(zip(texts, docs), 1):
+                analyzed[text] = (
+                    tuple(token.text for token in doc),
+                    tuple(token.lemma_ for token in doc) if self.config.lemma_matching else tuple()
+                )
+                if count % 500 == 0:
+                    print(f"  Processed {count}/{len(texts)} variations...")
+        
+        # Scatter results back to words
+        for word_data in words:
+            word_data['tokens'] = set()
+            word_data['lemmas'] = set()
+            word_data['sequences'] = []  # Token/lemma sequences for phrase matching
+            
+            for variation in word_data['variations']:
+                tokens, lemmas = analyzed[variation.lower()]
+                word_data['tokens'].update(tokens)
+                word_data['lemmas'].update(lemmas)
+                
+                if word_data['is_phrase']:
+                    word_data['sequences'].append(tokens)
+                    if lemmas:
+                        word_data['sequences'].append(lemmas)
         
-        print(f"✓ Preprocessed {len(self.word_list)} words")
+        self.preprocess_time = round(time.perf_counter() - start_time, 2)
+        print(f"✓ Preprocessed {len(words)} words ({len(texts)} distinct variations, "
+              f"{n_process} process{'es' if n_process > 1 else ''}) in {self.preprocess_time}s")
     
     def _build_lookup_tables(self):
         """Build fast lookup tables for matching"""
         print("Building lookup tables...")
         
-        self.lemma_to_word_idx = {}
-        self.token_to_word_idx = {}
-        self.phrase_patterns = []
+        # Tokens and lemmas are interned to spaCy StringStore hashes, the
+        # same IDs exposed by token.orth / token.lemma at match time
+        lemma_postings = {}
+        token_postings = {}
+        self.phrase_trie = {}  # token ID -> child node; None -> set of word indices
+        self.phrase_count = 0
+        expand = self._form_expander()
         
         for word_data in self.word_list:
-            idx = word_data['index']
-            
-            # Lemma lookup
-            for lemma in word_data.get('lemmas', []):
-                if lemma not in self.lemma_to_word_idx:
-                    self.lemma_to_word_idx[lemma] = set()
-                self.lemma_to_word_idx[lemma].add(idx)
-            
-            # Token lookup
-            for token in word_data.get('tokens', []):
-                if token not in self.token_to_word_idx:
-                    self.token_to_word_idx[token] = set()
-                self.token_to_word_idx[token].add(idx)
-            
-            # Phrase patterns
-            if word_data['is_phrase']:
-                for variation in word_data['variations']:
-                    self.phrase_patterns.append({
-                        'pattern': variation.lower(),
-                        'regex': re.compile(r'\b' + re.escape(variation.lower()) + r'\b'),
-                        'word_idx': idx
-                    })
+            self._index_word(word_data, lemma_postings, token_postings, expand)
+        
+        self.lemma_to_word_idx = IntPostings(lemma_postings)
+        self.token_to_word_idx = IntPostings(token_postings)
         
         print(f"✓ Built lookup tables: {len(self.lemma_to_word_idx)} lemmas, "
-              f"{len(self.token_to_word_idx)} tokens, {len(self.phrase_patterns)} phrases")
+              f"{len(self.token_to_word_idx)} tokens, {self.phrase_count} phrase forms")
+    
+    def _index_word(self, word_data: Dict, lemma_postings: Dict[int, Set[int]],
+                    token_postings: Dict[int, Set[int]], expand: Callable[[str], Set[int]]):
+        """Add one preprocessed word to postings dicts and the phrase trie"""
+        idx = word_data['index']
+        
+        # Lemma lookup
+        for lemma in word_data.get('lemmas', []):
+            lemma_postings.setdefault(hash_string(lemma), set()).add(idx)
+        
+        # Token lookup (plus every inflected form in lexicon mode)
+        for token in word_data.get('tokens', []):
+            for form in expand(token):
+                token_postings.setdefault(form, set()).add(idx)
+        
+        # Phrase trie (surface and lemma sequences share one automaton)
+        for sequence in set(word_data.get('sequences', [])):
+            for path in self._phrase_paths(sequence, expand):
+                node = self.phrase_trie
+                for key in path:
+                    node = node.setdefault(key, {})
+                node.setdefault(None, set()).add(idx)
+                self.phrase_count += 1
+    
+    def _form_expander(self) -> Callable[[str], Set[int]]:
+        """
+        Map a word-list token to the IDs it should match: just its own in
+        spaCy mode, every inflected form from core.lexicon in lexicon mode
+        """
+        if not (self.lexicon_mode and self.config.lemma_matching):
+            return lambda token: {hash_string(token)}
+        
+        try:
+            lexicon = load_lexicon()
+        except ValueError:
+            print("ERROR: lexicon matching requires the spacy-lookups-data package")
+            print("Install with: pip install spacy-lookups-data")
+            raise
+        
+        expanded = {}
+        def expand(token: str) -> Set[int]:
+            if token not in expanded:
+                expanded[token] = lexicon.expand(token)
+            return expanded[token]
+        return expand
+    
+    def _phrase_paths(self, sequence: Tuple[str, ...],
+                      expand: Callable[[str], Set[int]]) -> Iterator[Tuple[int, ...]]:
+        """Token ID sequences to insert into the phrase trie for one phrase form"""
+        options = [expand(token) for token in sequence]
+        combinations = 1
+        for forms in options:
+            combinations *= len(forms)
+        if combinations > self.PHRASE_EXPANSION_LIMIT:
+            options = [{hash_string(token)} for token in sequence]
+        return product(*options)
+    
+    def _build_fuzzy_index(self):
+        """Fuzzy tier for misspellings and accent-less text (not cached)"""
+        self.fuzzy_index = None
+        self._fuzzy_memo = {}  # sentence token ID -> matched word indices
+        if not self.config.fuzzy_matching or self.config.exact_match:
+            return
+        
+        token_words = {}  # Surface token -> word indices
+        for word_data in self.word_list:
+            for token in word_data.get('tokens', []):
+                token_words.setdefault(token, set()).add(word_data['index'])
+        
+        self.fuzzy_index = FuzzyIndex(token_words, self.config.fuzzy_threshold)
+        print(f"✓ Built fuzzy index: {len(self.fuzzy_index.terms)} terms, "
+              f"threshold {self.config.fuzzy_threshold}")
     
     def find_words_in_sentence(self, sentence: str) -> Set[int]:
         """
@@ -139,95 +460,534 @@ class EnhancedWordMatcher:
         if not sentence or not sentence.strip():
             return set()
         
-        found_words = set()
         sentence_lower = sentence.lower()
+        return self._match_analysis(self._analyze_text(sentence_lower), sentence_lower)
+    
+    def _analyze_text(self, text: str) -> Analysis:
+        """Analyze one lowercased sentence with the configured matching mode"""
+        if self.lexicon_mode:
+            return self._analyze_lexicon(text)
+        return self._analyze_doc(self.nlp(text))
+    
+    def _analyze_lexicon(self, text: str) -> Analysis:
+        """
+        Token IDs from the regex tokenizer (lexicon mode)
+        No lemmas: inflected forms are already in the token lookup table.
+        """
+        add = self.strings.add
+        return tuple(add(token) for token in split_words(text, self._keep_compound)), tuple()
+    
+    def _keep_compound(self, token: str) -> bool:
+        """Keep a hyphenated sentence word whole if the word list knows it"""
+        key = hash_string(token)
+        return key in self.token_to_word_idx or key in self.phrase_trie
+    
+    def _analyze_doc(self, doc) -> Analysis:
+        """Reduce a spaCy doc to the token and lemma IDs needed for matching"""
+        tokens = tuple(token.orth for token in doc)
+        lemmas = tuple(token.lemma for token in doc) if self.config.lemma_matching else tuple()
+        return tokens, lemmas
+    
+    def _match_analysis(self, analysis: Analysis, text: str = '') -> Set[int]:
+        """
+        Match word list against an already analyzed sentence
+        text is the lowercased sentence, only needed by the fuzzy tier
+        """
+        tokens, lemmas = analysis
         
-        # Process with spaCy
-        doc = self.nlp(sentence_lower)
-        tokens = {token.text for token in doc}
-        lemmas = {token.lemma_ for token in doc} if self.config.lemma_matching else set()
-        
-        # Method 1: Multi-word phrase matching (fastest for phrases)
-        for phrase_data in self.phrase_patterns:
-            if phrase_data['regex'].search(sentence_lower):
-                found_words.add(phrase_data['word_idx'])
+        # Method 1: Multi-word phrase matching (single pass over the phrase trie)
+        found_words = self._match_phrases(tokens, lemmas) if self.phrase_trie else set()
         
         # Method 2: Token-based lookup
-        for token in tokens:
-            if token in self.token_to_word_idx:
-                found_words.update(self.token_to_word_idx[token])
+        token_postings = self.token_to_word_idx
+        for token in set(tokens):
+            found_words.update(token_postings.get(token))
         
         # Method 3: Lemma-based lookup (for conjugations)
         if self.config.lemma_matching:
-            for lemma in lemmas:
-                if lemma in self.lemma_to_word_idx:
-                    found_words.update(self.lemma_to_word_idx[lemma])
+            lemma_postings = self.lemma_to_word_idx
+            for lemma in set(lemmas):
+                found_words.update(lemma_postings.get(lemma))
+        
+        # Method 4: Fuzzy lookup for tokens without an exact hit
+        if self.fuzzy_index is not None:
+            found_words.update(self._match_fuzzy(tokens, text))
         
         return found_words
     
-    def batch_process_sentences(self, sentences: List[str]) -> List[Set[int]]:
-        """Process multiple sentences in parallel"""
-        if not self.config.parallel_processing or len(sentences) < 100:
-            return [self.find_words_in_sentence(s) for s in sentences]
+    def _match_fuzzy(self, tokens: Tuple[int, ...], text: str) -> Set[int]:
+        """Resolve tokens without an exact hit through the fuzzy index"""
+        found = set()
+        for token in set(tokens):
+            if token not in self.token_to_word_idx:
+                found.update(self._fuzzy_lookup(token, text))
+        return found
+    
+    def _fuzzy_lookup(self, token: int, text: str) -> Tuple[int, ...]:
+        """Fuzzy matches for one sentence token ID (memoized)"""
+        memo = self._fuzzy_memo
+        if token in memo:
+            return memo[token]
+        
+        # IDs from the analysis cache may be unknown to this process's
+        # StringStore; tokenizing the sentence registers their strings
+        strings = self.strings
+        if token not in strings and text and not self.lexicon_mode:
+            self.nlp.tokenizer(text)
+        if token not in strings:
+            return tuple()
+        
+        matches = tuple(self.fuzzy_index.lookup(strings[token]))
+        if len(memo) >= self.FUZZY_MEMO_SIZE:
+            memo.clear()
+        memo[token] = matches
+        return matches
+    
+    def _match_phrases(self, tokens: Tuple[int, ...], lemmas: Tuple[int, ...],
+                       spans: Optional[List] = None) -> Set[int]:
+        """
+        Walk the phrase trie from every token position
+        Each position may advance on its surface form or its lemma, so
+        conjugated phrases ("fait attention") match their dictionary form.
+        If spans is given, (start, end, word indices) token spans are appended.
+        """
+        if lemmas:
+            keys = [{token, lemma} for token, lemma in zip(tokens, lemmas)]
+        else:
+            keys = [{token} for token in tokens]
+        
+        found = set()
+        for start in range(len(keys)):
+            frontier = [self.phrase_trie]
+            for position in range(start, len(keys)):
+                next_frontier = []
+                for node in frontier:
+                    for key in keys[position]:
+                        child = node.get(key)
+                        if child is not None:
+                            next_frontier.append(child)
+                            if None in child:
+                                found.update(child[None])
+                                if spans is not None:
+                                    spans.append((start, position + 1, child[None]))
+                if not next_frontier:
+                    break
+                frontier = next_frontier
+        
+        return found
+    
+    def batch_process_sentences(self, sentences: List[str],
+                                progress_callback: Optional[Callable[[int, int], None]] = None,
+                                as_bitsets: bool = False) -> List[Union[Set[int], int]]:
+        """
+        Process multiple sentences in batches through nlp.pipe
+        Sentences already in the analysis cache skip spaCy entirely; the rest
+        use config.max_workers processes when parallel processing is enabled.
+        Results are returned in input order; progress_callback(done, total)
+        is called after every batch. With as_bitsets each result is an int
+        with bit i set for word i (see core.bitset) instead of a set.
+        """
+        total = len(sentences)
+        texts = [s.lower() if s and s.strip() else '' for s in sentences]
+        results = [(0 if as_bitsets else set()) if not text else None for text in texts]
+        
+        pending = [i for i, text in enumerate(texts) if text]
+        done = total - len(pending)
+        
+        # Keep analyses around so explain() and update_coverage() never re-parse
+        record = self.config.record_match_details or self.config.incremental_updates
+        analyses = [None] * total if record else None
+        
+        # Serve what we can from the persistent analysis cache
+        if self.analysis_cache is not None and pending:
+            misses = []
+            for start in range(0, len(pending), self.ANALYSIS_CACHE_CHUNK):
+                chunk = pending[start:start + self.ANALYSIS_CACHE_CHUNK]
+                cached = self.analysis_cache.fetch([texts[i] for i in chunk])
+                for i, analysis in zip(chunk, cached):
+                    if analysis is None:
+                        misses.append(i)
+                    else:
+                        found = self._match_analysis(analysis, texts[i])
+                        results[i] = to_bitset(found) if as_bitsets else found
+                        done += 1
+                        if analyses is not None:
+                            analyses[i] = analysis
+                if progress_callback:
+                    progress_callback(done, total)
+            if len(misses) < len(pending):
+                print(f"✓ Loaded {len(pending) - len(misses)}/{len(pending)} "
+                      f"sentence analyses from cache")
+            pending = misses
+        
+        # Analyze the rest with spaCy (or only tokenize, in lexicon mode)
+        batch_size = max(1, self.config.batch_size)
+        if self.lexicon_mode:
+            analyzed = ((i, self._analyze_lexicon(texts[i])) for i in pending)
+        else:
+            n_process = 1
+            if self.config.parallel_processing and len(pending) >= self.PARALLEL_THRESHOLD:
+                n_process = max(1, self.config.max_workers)
+                print(f"Processing {len(pending)} sentences with {n_process} processes "
+                      f"(batch size {self.config.batch_size})...")
+            docs = self.nlp.pipe((texts[i] for i in pending), batch_size=batch_size,
+                                 n_process=n_process)
+            analyzed = ((i, self._analyze_doc(doc)) for i, doc in zip(pending, docs))
+        
+        to_store = []
+        for count, (i, analysis) in enumerate(analyzed, 1):
+            found = self._match_analysis(analysis, texts[i])
+            results[i] = to_bitset(found) if as_bitsets else found
+            if analyses is not None:
+                analyses[i] = analysis
+            
+            if self.analysis_cache is not None:
+                to_store.append((texts[i], analysis))
+                if len(to_store) >= self.ANALYSIS_CACHE_CHUNK:
+                    self.analysis_cache.store(to_store)
+                    to_store = []
+            
+            if progress_callback and (count % batch_size == 0 or count == len(pending)):
+                progress_callback(done + count, total)
+        
+        if to_store:
+            self.analysis_cache.store(to_store)
+        
+        if analyses is not None:
+            self._recorded_analyses = (sentences, analyses)
         
-        print(f"Processing {len(sentences)} sentences in parallel...")
-        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
-            results = list(executor.map(self.find_words_in_sentence, sentences))
         return results
     
+    def stream_coverage(self, sentences: Iterable[str], spill_path: Optional[Path] = None,
+                        progress_callback: Optional[Callable[[int], None]] = None
+                        ) -> Iterator[List[Tuple[int, Set[int]]]]:
+        """
+        Match a corpus of any size with bounded memory
+        Sentences are consumed lazily (e.g. from core.corpus.iter_sentences) in
+        chunks of config.stream_chunk_size; each chunk is yielded as a list of
+        (sentence_id, coverage) with ids counted from 0 in input order. If
+        spill_path is given, coverage is also appended to a compact
+        CoverageSpillWriter file for later passes. progress_callback(done) is
+        called after every chunk.
+        """
+        chunk_size = max(1, self.config.stream_chunk_size)
+        sentence_iter = iter(sentences)
+        next_id = 0
+        
+        spill = CoverageSpillWriter(spill_path) if spill_path else None
+        try:
+            while True:
+                chunk = list(islice(sentence_iter, chunk_size))
+                if not chunk:
+                    break
+                
+                coverage = self.batch_process_sentences(chunk)
+                if spill is not None:
+                    spill.write_many(coverage)
+                
+                yield [(next_id + offset, covered) for offset, covered in enumerate(coverage)]
+                next_id += len(chunk)
+                
+                if progress_callback:
+                    progress_callback(next_id)
+        finally:
+            if spill is not None:
+                spill.close()
+    
+    def explain(self, sentence_indices: Iterable[int]) -> Dict[int, List[Dict]]:
+        """
+        Explain matches for sentences of the last batch_process_sentences call
+        Requires config.record_match_details. Returns, per sentence index, one
+        entry per matched word with its match type (phrase/exact/lemma/fuzzy),
+        matched form and character span. No spaCy model is run.
+        """
+        if self._recorded_analyses is None:
+            raise RuntimeError("explain() requires record_match_details=True "
+                               "during batch_process_sentences")
+        
+        sentences, analyses = self._recorded_analyses
+        return {
+            idx: self._explain_analysis(analyses[idx], sentences[idx])
+            if analyses[idx] is not None else []
+            for idx in sentence_indices
+        }
+    
+    def _explain_analysis(self, analysis: Analysis, sentence: str) -> List[Dict]:
+        """
+        Describe how each word was matched in an analyzed sentence
+        Per word the first phrase, exact, lemma or fuzzy hit wins (in that
+        order). Only the tokenizer runs, to recover character offsets.
+        """
+        tokens, lemmas = analysis
+        text = sentence.lower()
+        matches = {}  # word_idx -> (match_type, start token, end token)
+        
+        if self.phrase_trie:
+            spans = []
+            self._match_phrases(tokens, lemmas, spans)
+            for start, end, word_indices in sorted(spans, key=lambda span: span[:2]):
+                for word_idx in word_indices:
+                    matches.setdefault(word_idx, ('phrase', start, end))
+        
+        inflected = []  # Lexicon mode: hits on a pre-expanded form count as lemma hits
+        for position, token in enumerate(tokens):
+            for word_idx in self.token_to_word_idx.get(token):
+                if self.lexicon_mode and not any(
+                        hash_string(own) == token for own in self.word_list[word_idx]['tokens']):
+                    inflected.append((word_idx, position))
+                else:
+                    matches.setdefault(word_idx, ('exact', position, position + 1))
+        for word_idx, position in inflected:
+            matches.setdefault(word_idx, ('lemma', position, position + 1))
+        
+        if self.config.lemma_matching:
+            for position, lemma in enumerate(lemmas):
+                for word_idx in self.lemma_to_word_idx.get(lemma):
+                    matches.setdefault(word_idx, ('lemma', position, position + 1))
+        
+        if self.fuzzy_index is not None:
+            for position, token in enumerate(tokens):
+                if token not in self.token_to_word_idx:
+                    for word_idx in self._fuzzy_lookup(token, text):
+                        matches.setdefault(word_idx, ('fuzzy', position, position + 1))
+        
+        offsets = self._token_offsets(text)
+        aligned = len(offsets) == len(tokens)
+        source = sentence if len(sentence) == len(text) else text
+        
+        explanation = []
+        for word_idx, (match_type, start, end) in sorted(matches.items(), key=lambda m: m[1][1:]):
+            char_start = offsets[start][0] if aligned else -1
+            char_end = offsets[end - 1][1] if aligned else -1
+            explanation.append({
+                'word_idx': word_idx,
+                'word': self.word_list[word_idx]['french'],
+                'match_type': match_type,
+                'matched_form': source[char_start:char_end] if aligned else None,
+                'start': char_start,
+                'end': char_end
+            })
+        return explanation
+    
+    def _token_offsets(self, text: str) -> List[Tuple[int, int]]:
+        """Character (start, end) of each token, tokenized as for matching"""
+        if self.lexicon_mode:
+            return [(start, start + len(token))
+                    for token, start in tokenize(text, self._keep_compound)]
+        return [(token.idx, token.idx + len(token)) for token in self.nlp.tokenizer(text)]
+    
     def get_match_details(self, word_idx: int, sentence: str) -> Dict:
         """Get detailed matching information for debugging"""
-        word_data = self.word_list[word_idx]
-        doc = self.nlp(sentence.lower())
-        sentence_lower = sentence.lower()
-        
         details = {
-            'word': word_data['french'],
+            'word': self.word_list[word_idx]['french'],
             'found': False,
             'match_type': None,
             'matched_form': None,
             'position': -1
         }
+        if not sentence or not sentence.strip():
+            return details
         
-        # Check phrase
-        if word_data['is_phrase']:
-            for variation in word_data['variations']:
-                match = re.search(r'\b' + re.escape(variation.lower()) + r'\b', sentence_lower)
-                if match:
-                    details.update({
-                        'found': True,
-                        'match_type': 'phrase',
-                        'matched_form': variation,
-                        'position': match.start()
-                    })
-                    return details
-        
-        # Check exact tokens
-        for token in doc:
-            if token.text in word_data['tokens']:
+        analysis = self._analyze_text(sentence.lower())
+        for match in self._explain_analysis(analysis, sentence):
+            if match['word_idx'] == word_idx:
                 details.update({
                     'found': True,
-                    'match_type': 'exact',
-                    'matched_form': token.text,
-                    'position': token.idx
+                    'match_type': match['match_type'],
+                    'matched_form': match['matched_form'],
+                    'position': match['start']
                 })
-                return details
-        
-        # Check lemmas
-        if self.config.lemma_matching:
-            for token in doc:
-                if token.lemma_ in word_data['lemmas']:
-                    details.update({
-                        'found': True,
-                        'match_type': 'lemma',
-                        'matched_form': token.text,
-                        'position': token.idx
-                    })
-                    return details
+                break
         
         return details
     
+    def add_words(self, words: Iterable[Dict]) -> List[int]:
+        """
+        Append words to the list, preprocessing and indexing only them
+        Returns their indices, for update_coverage.
+        """
+        new_words = [dict(word_data) for word_data in words]
+        start = len(self.word_list)
+        added = list(range(start, start + len(new_words)))
+        self._rebase_words(self.word_list + new_words, None, added)
+        return added
+    
+    def remove_words(self, indices: Iterable[int]) -> List[int]:
+        """
+        Remove words by index; later words move up to keep indices dense
+        Returns the old -> new index mapping (-1 for removed words), for
+        update_coverage.
+        """
+        removed = set(indices)
+        mapping, word_list = [], []
+        for idx, word_data in enumerate(self.word_list):
+            if idx in removed:
+                mapping.append(-1)
+            else:
+                mapping.append(len(word_list))
+                word_list.append(word_data)
+        
+        self._rebase_words(word_list, mapping, [])
+        return mapping
+    
+    def _rebase_words(self, word_list: List[Dict], mapping: Optional[Sequence[int]],
+                      fresh: Iterable[int]):
+        """
+        Switch to an edited word list, patching the lookup tables in place
+        mapping renumbers existing words (old -> new index, -1 drops a word;
+        None if indices are unchanged); fresh are the indices of new words.
+        """
+        fresh = list(fresh)
+        self.word_list = word_list
+        for idx, word_data in enumerate(word_list):
+            word_data['index'] = idx
+        if fresh:
+            self._preprocess_words(fresh)
+        
+        if mapping is not None:
+            self.phrase_count = self._remap_trie(mapping)
+        
+        lemma_additions, token_additions = {}, {}
+        expand = self._form_expander()
+        for idx in fresh:
+            self._index_word(word_list[idx], lemma_additions, token_additions, expand)
+        
+        self.lemma_to_word_idx = self.lemma_to_word_idx.updated(mapping, lemma_additions)
+        self.token_to_word_idx = self.token_to_word_idx.updated(mapping, token_additions)
+        
+        if self.fuzzy_index is not None:
+            self._build_fuzzy_index()
+        self._save_word_cache()
+    
+    def _remap_trie(self, mapping: Sequence[int]) -> int:
+        """
+        Renumber word indices at phrase trie terminals and prune nodes left
+        with neither a terminal nor children; returns phrase forms left
+        """
+        count = 0
+        # Post-order walk so a node is pruned only after its children were
+        stack = [(self.phrase_trie, None, None, False)]
+        while stack:
+            node, parent, parent_key, visited = stack.pop()
+            if not visited:
+                stack.append((node, parent, parent_key, True))
+                for key, child in node.items():
+                    if key is not None:
+                        stack.append((child, node, key, False))
+                continue
+            if None in node:
+                remapped = {mapping[idx] for idx in node[None] if mapping[idx] >= 0}
+                if remapped:
+                    node[None] = remapped
+                    count += len(remapped)
+                else:
+                    del node[None]
+            if not node and parent is not None:
+                del parent[parent_key]
+        return count
+    
+    def update_coverage(self, coverage: List[Union[Set[int], int]],
+                        mapping: Optional[Sequence[int]] = None, added: Iterable[int] = (),
+                        as_bitsets: bool = False) -> List[int]:
+        """
+        Bring coverage of the last batch_process_sentences call up to date
+        after remove_words (pass its mapping) or add_words (pass the added
+        indices). Entries are replaced in place (bitsets if as_bitsets). Only
+        sentences sharing a token or lemma ID with an added word are
+        re-matched from their recorded analyses (every sentence when fuzzy
+        matching is on, since typos share no IDs). In lexicon mode whether a
+        hyphenated word stays whole depends on the word list, so sentences
+        whose tokens change are re-tokenized as well, after either edit.
+        Requires config.incremental_updates. Returns the indices of
+        re-matched sentences.
+        """
+        if mapping is not None:
+            for sent_idx, covered in enumerate(coverage):
+                if not covered:
+                    continue
+                kept = {mapping[idx] for idx in (bitset_indices(covered) if as_bitsets else covered)
+                        if mapping[idx] >= 0}
+                coverage[sent_idx] = to_bitset(kept) if as_bitsets else kept
+        
+        added = list(added)
+        if not added and not (self.lexicon_mode and mapping is not None):
+            return []
+        
+        if self._recorded_analyses is None:
+            raise RuntimeError("update_coverage() requires incremental_updates=True "
+                               "during batch_process_sentences")
+        sentences, analyses = self._recorded_analyses
+        if len(analyses) != len(coverage):
+            raise ValueError("coverage does not belong to the last batch_process_sentences call")
+        
+        keys = self._word_keys(added)
+        affected = []
+        for sent_idx, analysis in enumerate(analyses):
+            if analysis is None:
+                continue
+            if self.lexicon_mode and '-' in sentences[sent_idx]:
+                fresh = self._analyze_lexicon(sentences[sent_idx].lower())
+                if fresh != analysis:
+                    analyses[sent_idx] = fresh
+                    affected.append(sent_idx)
+                    continue
+            if added and (self.fuzzy_index is not None
+                          or not keys.isdisjoint(analysis[0])
+                          or not keys.isdisjoint(analysis[1])):
+                affected.append(sent_idx)
+        
+        for sent_idx in affected:
+            found = self._match_analysis(analyses[sent_idx], sentences[sent_idx].lower())
+            coverage[sent_idx] = to_bitset(found) if as_bitsets else found
+        return affected
+    
+    def _word_keys(self, indices: Iterable[int]) -> Set[int]:
+        """Token and lemma IDs through which the given words can match"""
+        expand = self._form_expander()
+        keys = set()
+        for idx in indices:
+            word_data = self.word_list[idx]
+            keys.update(hash_string(lemma) for lemma in word_data.get('lemmas', []))
+            for token in word_data.get('tokens', []):
+                keys.update(expand(token))
+        return keys
+    
+    def _model_fingerprint(self) -> List[str]:
+        """Everything about the loaded model that influences tokens and lemmas"""
+        if self.lexicon_mode:
+            return ['lexicon', lexicon_version(), spacy.__version__,
+                    str(self.config.lemma_matching)]
+        return [
+            self.config.spacy_model,
+            self.config.nlp_profile,
+            self.nlp.meta.get('version', ''),
+            # The blank 'lookup' pipeline takes its lemmas from spacy-lookups-data
+            lexicon_version() if self.config.nlp_profile == 'lookup' else '',
+            spacy.__version__,
+            ','.join(self.nlp.pipe_names),
+            str(self.config.lemma_matching)
+        ]
+    
+    def _analysis_fingerprint(self) -> str:
+        """Identify everything that influences a sentence's tokens and lemmas"""
+        return ':'.join(self._model_fingerprint())
+    
     def _get_word_list_hash(self) -> str:
-        """Generate cache key from word list"""
-        word_str = ''.join([w['french'] for w in self.word_list])
-        return hashlib.md5(word_str.encode()).hexdigest() + '.pkl'
+        """
+        Generate cache key from the word list, model and matcher settings
+        Changing the model, its version, the NLP profile, the matching mode,
+        lemma_matching, the spacy-lookups-data version (lexicon mode and the
+        'lookup' profile) or the cache format yields a new key.
+        """
+        words = [self._word_key(word_data) for word_data in self.word_list]
+        key = json.dumps({
+            'version': self.CACHE_VERSION,
+            'model': self._model_fingerprint(),
+            'words': words
+        }, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.md5(key.encode('utf-8')).hexdigest() + '.wlc'
+    
+    def _word_key(self, word_data: Dict) -> str:
+        """Canonical form of a word entry's own fields (derived fields excluded)"""
+        return json.dumps({k: v for k, v in word_data.items() if k not in self.DERIVED_FIELDS},
+                          sort_keys=True, ensure_ascii=False, default=str)
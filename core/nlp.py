@@ -0,0 +1,133 @@
+"""
+spaCy pipeline loading with selectable profiles
+Trades lemma accuracy for faster startup and a smaller memory footprint.
+Pipelines are loaded once per process and shared by every matcher.
+"""
+
+import gc
+import os
+import time
+import threading
+import spacy
+from spacy.language import Language
+from typing import Dict, Iterable, Optional, Tuple
+from core.config import OptimizerConfig
+
+# Components never used for matching
+UNUSED_COMPONENTS = ['parser', 'ner', 'senter']
+
+# Components the rule-based French lemmatizer depends on (POS/morphology)
+LEMMATIZER_DEPENDENCIES = ['tok2vec', 'morphologizer', 'tagger', 'attribute_ruler']
+
+NLP_PROFILES = {
+    'full': 'Complete statistical pipeline (parser and NER disabled)',
+    'lemmatizer-only': 'Tokenizer and lemmatizer, plus the tagging components it needs',
+    'lookup': 'Blank French tokenizer with lookup-table lemmas, no statistical model',
+}
+
+# Process-wide registry: (model, profile, lemma_matching) -> (nlp, stats)
+_pipelines: Dict[Tuple[str, str, bool], Tuple[Language, Dict]] = {}
+_pipelines_lock = threading.Lock()
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident memory of this process in MB (None if unavailable)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def load_pipeline(model_name: str, profile: str = 'full',
+                  lemma_matching: bool = True) -> Tuple[Language, Dict]:
+    """
+    Load a spaCy pipeline for the given profile
+    Returns (nlp, stats) where stats reports load time and memory growth
+    """
+    if profile not in NLP_PROFILES:
+        raise ValueError(f"Unknown NLP profile: {profile} "
+                         f"(choose from {', '.join(NLP_PROFILES)})")
+
+    print(f"Loading spaCy model: {model_name} (profile: {profile})...")
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+
+    if profile == 'full':
+        nlp = spacy.load(model_name)
+        disable = ['parser', 'ner'] if lemma_matching else ['lemmatizer', 'parser', 'ner']
+        for component in disable:
+            if component in nlp.pipe_names:
+                nlp.disable_pipe(component)
+
+    elif profile == 'lemmatizer-only':
+        # Excluded components are never loaded, unlike disabled ones
+        nlp = spacy.load(model_name, exclude=UNUSED_COMPONENTS)
+        needs_tagging = (lemma_matching and 'lemmatizer' in nlp.pipe_names
+                         and nlp.get_pipe('lemmatizer').mode != 'lookup')
+        removable = [] if lemma_matching else ['lemmatizer']
+        if not needs_tagging:
+            removable += LEMMATIZER_DEPENDENCIES
+        for component in removable:
+            if component in nlp.pipe_names:
+                nlp.remove_pipe(component)
+
+    else:  # lookup
+        nlp = spacy.blank('fr')
+        if lemma_matching:
+            nlp.add_pipe('lemmatizer', config={'mode': 'lookup'})
+            nlp.initialize()  # Needs the spacy-lookups-data package
+
+    rss_after = current_rss_mb()
+    stats = {
+        'profile': profile,
+        'model': model_name,
+        'pipes': list(nlp.pipe_names),
+        'load_time': round(time.perf_counter() - start, 2),
+        'memory_mb': (round(rss_after - rss_before, 1)
+                      if rss_before is not None and rss_after is not None else None)
+    }
+    return nlp, stats
+
+
+def get_pipeline(model_name: str, profile: str = 'full',
+                 lemma_matching: bool = True) -> Tuple[Language, Dict]:
+    """
+    Return the shared pipeline for this model/profile, loading it on first use
+    stats['shared'] is True when an already loaded pipeline was reused
+    """
+    key = (model_name, profile, lemma_matching)
+    with _pipelines_lock:
+        shared = key in _pipelines
+        if not shared:
+            _pipelines[key] = load_pipeline(model_name, profile, lemma_matching)
+        nlp, stats = _pipelines[key]
+    return nlp, dict(stats, shared=shared)
+
+
+def preload_pipelines(configs: Iterable[OptimizerConfig], freeze: bool = True):
+    """
+    Load pipelines up front, e.g. in a server master process before it forks
+    workers. With freeze=True the loaded objects are moved out of the garbage
+    collector's reach (gc.freeze) so forked workers keep sharing the model
+    pages copy-on-write instead of touching and copying them.
+    """
+    for config in configs:
+        get_pipeline(config.spacy_model, config.nlp_profile, config.lemma_matching)
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
+
+
+def clear_pipelines():
+    """Drop all shared pipelines (they are reloaded on next use)"""
+    with _pipelines_lock:
+        _pipelines.clear()
@@ -1,14 +1,116 @@
 """
 Enhanced Sentence Optimizer with improved algorithms and performance
-Supports greedy, weighted greedy, and beam search optimization
+Supports greedy, weighted greedy, beam search, exact, portfolio and GRASP optimization
 """
 
+import io
+import math
 import time
 import heapq
-from typing import List, Set, Dict, Callable, Optional, Tuple
-from dataclasses import dataclass, field
+import random
+import contextlib
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+from itertools import chain
+from typing import List, Set, Dict, Callable, Iterable, Optional, Sequence, Tuple
+from dataclasses import dataclass, field, replace
 from core.matcher import EnhancedWordMatcher
 from core.config import OptimizerConfig
+from core.corpus import deduplicate_sentences
+from core.bitset import to_bitset, bitset_indices, full_bitset
+from core.sparse import CoverageMatrix, CoverageRows, CoverageColumns, share_matrix, attach_matrix
+from core.exact import solve_set_cover, solve_partial_cover
+from core.local_search import improve_cover
+from core.reduction import reduce_instance
+
+
+# Sentence bitsets of the running beam search, inherited by pool workers
+_beam_coverage: List[int] = []
+
+
+def _init_beam_worker(coverage: List[int]):
+    """Pool initializer: receive the sentence bitsets once per worker"""
+    global _beam_coverage
+    _beam_coverage = coverage
+
+
+def _beam_candidates(uncovered: int, start: int, stop: int, k: int,
+                     coverage: Optional[List[int]] = None) -> List[Tuple[int, int]]:
+    """
+    Best k expansions of a beam state among sentences start..stop-1, as
+    (-gain, sentence index); sentences that add nothing are left out
+    """
+    coverage = _beam_coverage if coverage is None else coverage
+    gains = ((-(coverage[idx] & uncovered).bit_count(), idx) for idx in range(start, stop))
+    return heapq.nsmallest(k, (gain for gain in gains if gain[0]))
+
+
+# Selection worker state (portfolio and GRASP pools): an optimizer over the
+# shared coverage (kept open in _worker_block), and the config, selection,
+# set-aside words and deadline every job starts from
+_worker_block: Optional[SharedMemory] = None
+_worker_optimizer: Optional['EnhancedSentenceOptimizer'] = None
+_worker_start: Tuple = ()
+
+
+def _init_selection_worker(shared_name: str, layout: Tuple[int, int, int], word_list: List[Dict],
+                           config: OptimizerConfig, base: List[int], set_aside: Set[int],
+                           deadline: Optional[float]):
+    """Pool initializer: attach to the shared coverage once per worker"""
+    global _worker_block, _worker_optimizer, _worker_start
+    _worker_block, matrix = attach_matrix(shared_name, layout)
+    optimizer = EnhancedSentenceOptimizer(word_list, [''] * layout[0], config)
+    with contextlib.redirect_stdout(io.StringIO()):
+        optimizer._index_coverage(matrix)
+    _worker_optimizer = optimizer
+    _worker_start = (config, base, set_aside, deadline)
+
+
+def _start_job(overrides: Dict) -> 'EnhancedSentenceOptimizer':
+    """Reset the worker's optimizer to the shared starting point"""
+    optimizer = _worker_optimizer
+    config, base, set_aside, deadline = _worker_start
+    optimizer.config = replace(config, **overrides)
+    optimizer.exact_stats, optimizer.improvement_stats = {}, {}
+    optimizer.set_aside_words = set(set_aside)
+    optimizer.deadline, optimizer.stop_reason = deadline, ""
+    with contextlib.redirect_stdout(io.StringIO()):
+        optimizer._apply_selection(base)
+    return optimizer
+
+
+def _job_outcome(optimizer: 'EnhancedSentenceOptimizer', start_time: float) -> Dict:
+    """What a pool job sends back: the selection, its coverage and statistics"""
+    return {
+        'indices': [s['unique_index'] for s in optimizer.selected_sentences],
+        'words_covered': (len(optimizer.word_list) - len(optimizer.uncovered_words)
+                          - len(optimizer.set_aside_words)),
+        'stop_reason': optimizer.stop_reason,
+        'exact_stats': optimizer.exact_stats,
+        'improvement_stats': optimizer.improvement_stats,
+        'time': round(time.time() - start_time, 3)
+    }
+
+
+def _run_contestant(algorithm: str, overrides: Dict) -> Dict:
+    """Run one portfolio contestant (algorithm + config overrides) from the shared start"""
+    start_time = time.time()
+    optimizer = _start_job(overrides)
+    with contextlib.redirect_stdout(io.StringIO()):
+        optimizer._run_algorithm(algorithm)
+    return _job_outcome(optimizer, start_time)
+
+
+def _run_grasp_start(seed: int) -> Dict:
+    """One GRASP start: randomized greedy with this seed, then local search"""
+    start_time = time.time()
+    optimizer = _start_job({})
+    with contextlib.redirect_stdout(io.StringIO()):
+        optimizer._optimize_randomized_greedy(random.Random(seed))
+        if optimizer.selected_sentences:
+            optimizer._improve_selection()
+    return _job_outcome(optimizer, start_time)
 
 
 @dataclass
@@ -25,6 +127,13 @@ class OptimizationResult:
     coverage_map: List[Dict] = field(default_factory=list)
     algorithm_used: str = "greedy"
     iterations: int = 0
+    dedup_stats: Dict = field(default_factory=dict)
+    exact_stats: Dict = field(default_factory=dict)  # Lower bound and gap ('exact' only)
+    improvement_stats: Dict = field(default_factory=dict)  # Local search after the algorithm
+    reduction_stats: Dict = field(default_factory=dict)  # Forced/dropped sentences, uncoverable words
+    portfolio_stats: Dict = field(default_factory=dict)  # Winner and each contestant's size/time ('portfolio' only)
+    grasp_stats: Dict = field(default_factory=dict)  # Best seed and each start's size ('grasp' only)
+    stop_reason: str = ""  # 'coverage target' | 'time budget' | 'max iterations', or "" if run to the end
 
 
 class EnhancedSentenceOptimizer:
@@ -32,6 +141,22 @@ class EnhancedSentenceOptimizer:
     Enhanced optimizer with multiple algorithms and performance improvements
     """
     
+    # Weighted greedy scoring
+    NEW_WORD_WEIGHT = 10.0  # Prioritize new words
+    REDUNDANCY_WEIGHT = 0.5  # But value reinforcing covered words
+    
+    # Minimum gain evaluations per beam level (states x sentences) before the
+    # expansions fan out to worker processes; a process scores ~10M per second
+    PARALLEL_THRESHOLD = 2000000
+    
+    # Portfolio contestants: (algorithm, config overrides)
+    PORTFOLIO = (
+        ('greedy', {}),
+        ('weighted_greedy', {}),
+        ('beam_search', {}),
+        ('beam_search', {'beam_width': 10, 'beam_depth': 5}),
+    )
+    
     def __init__(self, 
                  word_list: List[Dict], 
                  sentences: List[str],
@@ -39,94 +164,266 @@ class EnhancedSentenceOptimizer:
                  callback: Optional[Callable] = None):
         
         self.word_list = word_list
-        self.sentences = sentences
+        self.sentences = sentences  # Unique sentences once deduplicated
+        self.original_sentences = sentences
+        self.original_rows = None  # Unique sentence index -> original row indices
         self.config = config or OptimizerConfig()
         self.callback = callback
+        if self.config.coverage_format not in ('set', 'bitset'):
+            raise ValueError(f"Unknown coverage format: {self.config.coverage_format}")
+        if self.config.gain_backend not in ('python', 'sparse'):
+            raise ValueError(f"Unknown gain backend: {self.config.gain_backend}")
         
-        self.matcher = EnhancedWordMatcher(word_list, config)
+        # Bitset mode: coverage is one int per sentence and gains are popcounts
+        self.use_bitsets = self.config.coverage_format == 'bitset'
+        self._size = int.bit_count if self.use_bitsets else len
+        
+        self._matcher = None  # Built on first use (portfolio workers only need coverage)
         self.selected_sentences = []
+        self.selected_indices = set()  # Indices of selected_sentences, for O(1) lookups
+        self.dedup_stats = {}
+        self.exact_stats = {}
+        self.improvement_stats = {}
+        self.reduction_stats = {}
+        self.portfolio_stats = {}
+        self.grasp_stats = {}
         self.coverage_map = {}  # word_idx -> list of sentence indices
         self.uncovered_words = set()
+        self.uncovered_bits = 0  # uncovered_words as a bitset (bitset mode)
+        self.set_aside_words = set()  # Uncoverable words, hidden from the algorithms during a run
+        self.deadline = None  # End of the time budget (time.time() value), None if unlimited
+        self.stop_reason = ""
         self.sentence_coverage = []  # Precomputed coverage for each sentence
+        self.coverage_matrix = None  # CSR copy of sentence_coverage (sparse gain backend)
+    
+    @property
+    def matcher(self) -> EnhancedWordMatcher:
+        """Word matcher, built on first use"""
+        if self._matcher is None:
+            self._matcher = EnhancedWordMatcher(self.word_list, self.config)
+        return self._matcher
     
     def optimize(self, algorithm: str = "weighted_greedy") -> OptimizationResult:
         """
         Run optimization with specified algorithm
-        Algorithms: 'greedy', 'weighted_greedy', 'beam_search'
+        Algorithms: 'greedy', 'weighted_greedy', 'beam_search', 'exact', 'portfolio', 'grasp'
         """
         start_time = time.time()
         
-        # Precompute sentence coverage
-        self._precompute_coverage()
+        # Precompute sentence coverage (kept across runs, see update_words)
+        if self.sentence_coverage:
+            self._index_coverage()
+        else:
+            self._precompute_coverage()
+        
+        # The time budget covers selection only, not sentence matching
+        self.deadline = time.time() + self.config.time_budget if self.config.time_budget > 0 else None
+        self.stop_reason = ""
+        
+        # Shrink the instance; the full coverage is restored after the algorithm
+        full_coverage = self._reduce_instance() if self.config.reduce_instance else None
+        
+        try:
+            self._run_algorithm(algorithm)
+        finally:
+            if full_coverage is not None:
+                self._restore_instance(full_coverage)
         
-        # Run selected algorithm
+        if self.stop_reason:
+            print(f"  Stopped early: {self.stop_reason} reached")
+        
+        # Build results
+        end_time = time.time()
+        return self._build_results(end_time - start_time, algorithm)
+    
+    def _run_algorithm(self, algorithm: str):
+        """Run the selected algorithm from the current selection, then local search"""
         if algorithm == "greedy":
             self._optimize_greedy()
         elif algorithm == "weighted_greedy":
             self._optimize_weighted_greedy()
         elif algorithm == "beam_search":
             self._optimize_beam_search()
+        elif algorithm == "exact":
+            self._optimize_exact()
+        elif algorithm == "portfolio":
+            self._optimize_portfolio()
+            return  # Contestants already ran local search
+        elif algorithm == "grasp":
+            self._optimize_grasp()
+            return  # Every start ends with local search
         else:
             raise ValueError(f"Unknown algorithm: {algorithm}")
         
-        # Build results
-        end_time = time.time()
-        return self._build_results(end_time - start_time, algorithm)
+        if self.config.improve_selection and self.selected_sentences:
+            self._improve_selection()
+            if self.exact_stats:
+                self._update_exact_stats()
     
     def _precompute_coverage(self):
         """Precompute word coverage for all sentences with progress"""
+        # Collapse duplicate sentences so each is analyzed and scanned once
+        if self.config.deduplicate_sentences:
+            corpus = deduplicate_sentences(self.original_sentences)
+            self.sentences = corpus.sentences
+            self.original_rows = corpus.original_rows
+            self.dedup_stats = corpus.stats()
+            print(f"✓ Deduplicated corpus: {corpus.total_rows} → {len(corpus.sentences)} "
+                  f"sentences ({self.dedup_stats['saved_percent']}% less work)")
+        
         print("Precomputing sentence coverage...")
         self._report_progress('Analyzing sentences...', 0, len(self.sentences), 0, 0)
         
-        # Use batch processing if enabled
-        if self.config.parallel_processing:
-            self.sentence_coverage = self.matcher.batch_process_sentences(self.sentences)
+        # Batched analysis (multi-process when parallel processing is enabled)
+        self.sentence_coverage = self.matcher.batch_process_sentences(
+            self.sentences,
+            progress_callback=lambda done, total: self._report_progress(
+                'Analyzing sentences...', done, total, 0, 0),
+            as_bitsets=self.use_bitsets
+        )
+        
+        self._index_coverage()
+        
+        print(f"✓ Analysis complete: {len(self.sentences)} sentences processed")
+    
+    def _index_coverage(self, matrix: Optional[CoverageMatrix] = None):
+        """
+        Build the coverage map and reset the selection state. With a matrix
+        (a worker's view of the shared coverage), the coverage map reads from
+        it and sentence_coverage is built from it once, since the algorithms
+        read every row many times
+        """
+        self.coverage_map = {}
+        self.set_aside_words = set()
+        self.exact_stats = {}
+        self.improvement_stats = {}
+        self.reduction_stats = {}
+        self.portfolio_stats = {}
+        self.grasp_stats = {}
+        
+        if matrix is not None:
+            self.sentence_coverage = list(CoverageRows(matrix, self.use_bitsets))
+            self.coverage_map = CoverageColumns(matrix)
         else:
-            self.sentence_coverage = []
-            for idx, sentence in enumerate(self.sentences):
-                covered = self.matcher.find_words_in_sentence(sentence)
-                self.sentence_coverage.append(covered)
-                
-                if (idx + 1) % 100 == 0:
-                    self._report_progress('Analyzing sentences...', idx + 1, 
-                                        len(self.sentences), 0, 0)
+            # Build coverage map
+            for sent_idx, covered in enumerate(self.sentence_coverage):
+                for word_idx in (bitset_indices(covered) if self.use_bitsets else covered):
+                    if word_idx not in self.coverage_map:
+                        self.coverage_map[word_idx] = []
+                    self.coverage_map[word_idx].append(sent_idx)
+        
+        self._reset_selection()
         
-        # Build coverage map
-        for sent_idx, covered in enumerate(self.sentence_coverage):
-            for word_idx in covered:
-                if word_idx not in self.coverage_map:
-                    self.coverage_map[word_idx] = []
-                self.coverage_map[word_idx].append(sent_idx)
+        if self.config.gain_backend == 'sparse':
+            if matrix is not None:
+                self.coverage_matrix = matrix
+            else:
+                self._build_coverage_matrix()
+    
+    def _build_coverage_matrix(self):
+        """CSR copy of sentence_coverage for the sparse gain backend"""
+        rows = ([bitset_indices(covered) for covered in self.sentence_coverage]
+                if self.use_bitsets else self.sentence_coverage)
+        self.coverage_matrix = CoverageMatrix(rows, len(self.word_list))
+    
+    def _reset_selection(self):
+        """Start over with no sentences selected and every word uncovered"""
+        self.selected_sentences = []
+        self.selected_indices = set()
+        self.uncovered_words = set(range(len(self.word_list))) - self.set_aside_words
+        self.uncovered_bits = full_bitset(len(self.word_list)) & ~to_bitset(self.set_aside_words)
+    
+    def update_words(self, added: Iterable[Dict] = (), removed: Iterable[int] = ()) -> Dict:
+        """
+        Edit the word list between optimize() runs without re-analyzing the
+        corpus: lookup tables are patched and only sentences containing an
+        added word's tokens or lemmas are re-matched (needs
+        config.incremental_updates). Removed words are given by index.
+        """
+        start_time = time.time()
+        removed = sorted(set(removed))
+        added = list(added)
+        rematched = []
         
-        # Initialize uncovered words
-        self.uncovered_words = set(range(len(self.word_list)))
+        # Fail before the matcher changes: coverage that cannot be patched
+        # would leave it out of step with the optimizer
+        if (self.sentence_coverage and (added or (removed and self.matcher.lexicon_mode))
+                and not self.config.incremental_updates):
+            raise RuntimeError("update_words() requires incremental_updates=True "
+                               "when the corpus was analyzed")
         
-        print(f"✓ Analysis complete: {len(self.sentences)} sentences processed")
+        try:
+            if removed:
+                mapping = self.matcher.remove_words(removed)
+                if self.sentence_coverage:
+                    rematched = self.matcher.update_coverage(self.sentence_coverage, mapping=mapping,
+                                                             as_bitsets=self.use_bitsets)
+            if added:
+                new_indices = self.matcher.add_words(added)
+                if self.sentence_coverage:
+                    rematched += self.matcher.update_coverage(self.sentence_coverage, added=new_indices,
+                                                              as_bitsets=self.use_bitsets)
+        finally:
+            self.word_list = self.matcher.word_list
+        stats = {
+            'added': len(added),
+            'removed': len(removed),
+            'total_words': len(self.word_list),
+            'rematched_sentences': len(rematched),
+            'time': round(time.time() - start_time, 3)
+        }
+        print(f"✓ Word list updated: +{stats['added']} / -{stats['removed']} words, "
+              f"{stats['rematched_sentences']} sentences re-matched in {stats['time']}s")
+        return stats
     
     def _optimize_greedy(self):
-        """Standard greedy algorithm - always pick sentence covering most uncovered words"""
+        """
+        Standard greedy algorithm - always pick sentence covering most uncovered words
+        Lazy evaluation: gains only shrink as words get covered, so heap entries
+        are upper bounds and only the top one needs rescoring. Ties go to the
+        lowest sentence index, exactly as a full rescan would pick.
+        """
+        if self.coverage_matrix is not None:
+            return self._optimize_sparse(weighted=False)
+        
         print("Running greedy optimization...")
         iteration = 0
         
-        while self.uncovered_words and len(self.selected_sentences) < self.config.max_sentences:
+        size = self._size
+        coverage = self.sentence_coverage
+        
+        # Max-heap of (-gain, sentence index); zero-gain sentences never qualify
+        uncovered = self._uncovered()
+        heap = []
+        for idx, covered in enumerate(coverage):
+            gain = size(covered & uncovered)
+            if gain and idx not in self.selected_indices:
+                heap.append((-gain, idx))
+        heapq.heapify(heap)
+        
+        while (self.uncovered_words and len(self.selected_sentences) < self.config.max_sentences
+               and not self._should_stop()):
             iteration += 1
-            best_idx, best_coverage, best_score = None, set(), 0
+            best_idx, best_coverage = None, set()
+            uncovered = self._uncovered()
             
-            # Find best sentence
-            for idx, covered in enumerate(self.sentence_coverage):
-                if self._is_already_selected(idx):
-                    continue
+            # Find best sentence: rescore the top until its bound is exact
+            while heap:
+                neg_gain, idx = heap[0]
+                new_coverage = coverage[idx] & uncovered
+                score = size(new_coverage)
                 
-                new_coverage = covered & self.uncovered_words
-                score = len(new_coverage)
-                
-                if score > best_score:
-                    best_score = score
-                    best_idx = idx
-                    best_coverage = new_coverage
+                if score == -neg_gain:
+                    heapq.heappop(heap)
+                    best_idx, best_coverage = idx, new_coverage
+                    break
+                if score:
+                    heapq.heapreplace(heap, (-score, idx))
+                else:
+                    heapq.heappop(heap)
             
             # No improvement possible
-            if best_score == 0:
+            if best_idx is None:
                 print(f"  No more improvements possible at iteration {iteration}")
                 break
             
@@ -147,40 +444,65 @@ class EnhancedSentenceOptimizer:
         """
         Weighted greedy - considers both new words AND reinforcement of existing coverage
         Better for finding robust sentence sets
+        Per-sentence new-word counters are kept up to date through coverage_map,
+        so each pick only rescores sentences sharing a newly covered word; the
+        best score comes from a heap whose outdated entries are skipped.
         """
+        if self.coverage_matrix is not None:
+            return self._optimize_sparse(weighted=True)
+        
         print("Running weighted greedy optimization...")
         iteration = 0
         
-        # Weights
-        NEW_WORD_WEIGHT = 10.0  # Prioritize new words
-        REDUNDANCY_WEIGHT = 0.5  # But value reinforcing covered words
+        size = self._size
+        coverage = self.sentence_coverage
+        uncovered = self._uncovered()
         
-        while self.uncovered_words and len(self.selected_sentences) < self.config.max_sentences:
+        # Counters per sentence: redundant = total - new
+        totals = [size(covered) for covered in coverage]
+        new_counts = [size(covered & uncovered) for covered in coverage]
+        
+        def score_of(idx):
+            new_count = new_counts[idx]
+            redundant_count = totals[idx] - new_count
+            return new_count * self.NEW_WORD_WEIGHT + redundant_count * self.REDUNDANCY_WEIGHT
+        
+        # Max-heap of (-score, sentence index); ties go to the lowest index
+        scores = [score_of(idx) for idx in range(len(coverage))]
+        heap = [(-score, idx) for idx, score in enumerate(scores)
+                if score > 0 and idx not in self.selected_indices]
+        heapq.heapify(heap)
+        
+        while (self.uncovered_words and len(self.selected_sentences) < self.config.max_sentences
+               and not self._should_stop()):
             iteration += 1
-            best_idx, best_coverage, best_score = None, set(), 0.0
+            best_idx = None
             
-            for idx, covered in enumerate(self.sentence_coverage):
-                if self._is_already_selected(idx):
-                    continue
-                
-                new_coverage = covered & self.uncovered_words
-                redundant_coverage = covered - self.uncovered_words
-                
-                # Weighted score
-                score = (len(new_coverage) * NEW_WORD_WEIGHT + 
-                        len(redundant_coverage) * REDUNDANCY_WEIGHT)
-                
-                if score > best_score:
-                    best_score = score
+            # Skip entries for selected sentences or scores that have changed
+            while heap:
+                neg_score, idx = heapq.heappop(heap)
+                if -neg_score == scores[idx] and idx not in self.selected_indices:
                     best_idx = idx
-                    best_coverage = new_coverage
+                    break
             
-            if best_score == 0:
+            if best_idx is None:
                 print(f"  No more improvements possible at iteration {iteration}")
                 break
             
+            best_coverage = coverage[best_idx] & self._uncovered()
             self._add_sentence(best_idx, best_coverage)
             
+            # Newly covered words turn from new into redundant for every sentence holding them
+            changed = set()
+            for word_idx in (bitset_indices(best_coverage) if self.use_bitsets else best_coverage):
+                for sent_idx in self.coverage_map.get(word_idx, ()):
+                    new_counts[sent_idx] -= 1
+                    changed.add(sent_idx)
+            for sent_idx in changed:
+                scores[sent_idx] = score_of(sent_idx)
+                if sent_idx not in self.selected_indices:
+                    heapq.heappush(heap, (-scores[sent_idx], sent_idx))
+            
             if iteration % self.config.progress_interval == 0:
                 self._report_progress(
                     'Optimizing (Weighted Greedy)...',
@@ -190,78 +512,631 @@ class EnhancedSentenceOptimizer:
                     len(self.selected_sentences)
                 )
     
-    def _optimize_beam_search(self, beam_width: int = 5, depth: int = 3):
+    def _optimize_sparse(self, weighted: bool):
+        """
+        Greedy / weighted greedy on the CSR backend: all new-word counts come
+        from one matrix-vector product with the uncovered-word mask, and each
+        pick subtracts the columns of the words it covered. Picks are the same
+        as the set-based loops (np.argmax also prefers the lowest index)
+        """
+        label = 'Weighted Greedy' if weighted else 'Greedy'
+        print(f"Running {label.lower()} optimization (sparse backend)...")
+        iteration = 0
+        
+        matrix = self.coverage_matrix
+        mask = np.zeros(len(self.word_list), dtype=np.int64)
+        mask[list(self.uncovered_words)] = 1
+        new_counts = matrix.dot(mask)
+        selected = np.zeros(len(matrix), dtype=bool)
+        selected[list(self.selected_indices)] = True
+        
+        while (self.uncovered_words and len(matrix)
+               and len(self.selected_sentences) < self.config.max_sentences
+               and not self._should_stop()):
+            iteration += 1
+            
+            if weighted:
+                scores = (new_counts * self.NEW_WORD_WEIGHT +
+                          (matrix.row_sizes - new_counts) * self.REDUNDANCY_WEIGHT)
+                scores[selected] = 0
+            else:
+                scores = new_counts  # Selected sentences have no new words left
+            
+            best_idx = int(np.argmax(scores))
+            if scores[best_idx] == 0:
+                print(f"  No more improvements possible at iteration {iteration}")
+                break
+            
+            best_coverage = self.sentence_coverage[best_idx] & self._uncovered()
+            self._add_sentence(best_idx, best_coverage)
+            selected[best_idx] = True
+            matrix.subtract_columns(
+                new_counts, bitset_indices(best_coverage) if self.use_bitsets else list(best_coverage))
+            
+            if iteration % self.config.progress_interval == 0:
+                self._report_progress(
+                    f'Optimizing ({label})...',
+                    iteration,
+                    len(self.word_list),
+                    len(self.word_list) - len(self.uncovered_words),
+                    len(self.selected_sentences)
+                )
+    
+    def _optimize_beam_search(self, beam_width: Optional[int] = None, depth: Optional[int] = None):
         """
         Beam search - explores multiple paths simultaneously
         More thorough but slower
+        States are (uncovered-word bitset, selected indices). States leaving the
+        same words uncovered are merged, and each state only keeps its
+        beam_width best expansions, so a level holds at most beam_width^2 states.
         """
+        beam_width = max(1, beam_width or self.config.beam_width)
+        depth = self.config.beam_depth if depth is None else depth
+        depth = max(0, min(depth, self.config.max_sentences - len(self.selected_sentences),
+                           self.config.max_iterations - len(self.selected_sentences)))
         print(f"Running beam search (width={beam_width}, depth={depth})...")
         
-        # Priority queue: (negative_coverage, sentence_indices_set, uncovered_words)
-        beam = [(0, tuple(), self.uncovered_words.copy())]
+        coverage = (self.sentence_coverage if self.use_bitsets
+                    else [to_bitset(covered) for covered in self.sentence_coverage])
+        uncovered = self.uncovered_bits if self.use_bitsets else to_bitset(self.uncovered_words)
         
-        for level in range(depth):
-            print(f"  Beam search level {level + 1}/{depth}...")
-            next_beam = []
-            
-            for neg_coverage, selected_tuple, uncovered in beam:
-                selected_set = set(selected_tuple)
+        # Spread each level's gain evaluations over worker processes, in chunks of sentences
+        pool, chunks = None, [(0, len(coverage))]
+        n_process = max(1, self.config.max_workers)
+        if (self.config.parallel_processing and n_process > 1 and depth
+                and len(coverage) * beam_width >= self.PARALLEL_THRESHOLD):
+            step = -(-len(coverage) // n_process)
+            chunks = [(start, min(start + step, len(coverage)))
+                      for start in range(0, len(coverage), step)]
+            pool = ProcessPoolExecutor(max_workers=n_process, initializer=_init_beam_worker,
+                                       initargs=(coverage,))
+            print(f"  Scoring expansions with {n_process} processes...")
+        
+        # Beam entries: (uncovered word count, selected indices, uncovered bitset)
+        beam = [(uncovered.bit_count(), tuple(), uncovered)]
+        
+        try:
+            for level in range(depth):
+                if self._should_stop():
+                    break
+                print(f"  Beam search level {level + 1}/{depth}...")
+                expansions = self._expand_beam(beam, coverage, beam_width, pool, chunks)
+                if not any(expansions):
+                    break
                 
-                # Try adding each candidate sentence
-                candidates = []
-                for idx, covered in enumerate(self.sentence_coverage):
-                    if idx in selected_set:
-                        continue
-                    
-                    new_coverage = covered & uncovered
-                    if not new_coverage:
-                        continue
-                    
-                    new_uncovered = uncovered - new_coverage
-                    new_selected = selected_tuple + (idx,)
-                    score = -(len(self.word_list) - len(new_uncovered))  # Negative for max heap
-                    
-                    candidates.append((score, new_selected, new_uncovered))
+                next_beam = []
+                for (count, selected, uncovered), best in zip(beam, expansions):
+                    if not best:
+                        next_beam.append((count, selected, uncovered))  # Nothing left to add
+                    for neg_gain, idx in best:
+                        next_beam.append((count + neg_gain, selected + (idx,),
+                                          uncovered & ~coverage[idx]))
                 
-                # Keep top beam_width candidates
-                candidates.sort()
-                next_beam.extend(candidates[:beam_width])
-            
-            # Keep overall top beam_width
-            next_beam.sort()
-            beam = next_beam[:beam_width]
-            
-            if not beam:
+                # Keep overall top beam_width distinct states (shorter paths win ties)
+                next_beam.sort(key=lambda state: (state[0], len(state[1]), state[1]))
+                beam, seen = [], set()
+                for state in next_beam:
+                    if state[2] not in seen:
+                        seen.add(state[2])
+                        beam.append(state)
+                        if len(beam) == beam_width:
+                            break
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        # Use best path, up to the coverage target
+        _, best_selected, _ = beam[0]
+        for sent_idx in best_selected:
+            if self._target_reached():
                 break
+            covered = self.sentence_coverage[sent_idx] & self._uncovered()
+            self._add_sentence(sent_idx, covered)
         
-        # Use best path
-        if beam:
-            _, best_selected, final_uncovered = beam[0]
-            for sent_idx in best_selected:
-                covered = self.sentence_coverage[sent_idx] & self.uncovered_words
-                self._add_sentence(sent_idx, covered)
-            
-            print(f"✓ Beam search selected {len(best_selected)} sentences")
+        print(f"✓ Beam search selected {len(best_selected)} sentences")
         
         # Continue with greedy if not complete
         if self.uncovered_words and len(self.selected_sentences) < self.config.max_sentences:
             print("  Continuing with greedy...")
             self._optimize_greedy()
     
+    def _optimize_exact(self):
+        """
+        Exact minimum cover by branch and bound (see core.exact), warm-started
+        from greedy. Below a 100% coverage target it finds the fewest sentences
+        reaching the target instead. Stops after config.exact_time_limit
+        seconds with the best selection found and a proven lower bound on the
+        optimum
+        """
+        print(f"Running exact optimization (time limit {self.config.exact_time_limit}s)...")
+        
+        # Sentences with identical coverage are interchangeable: search one of each
+        as_key = int if self.use_bitsets else frozenset
+        rows, row_of = [], {}
+        for idx, covered in enumerate(self.sentence_coverage):
+            key = as_key(covered)
+            if key and key not in row_of:
+                row_of[key] = len(rows)
+                rows.append(idx)
+        # Rows in word order, so the bounds' float sums match across coverage formats
+        matrix = CoverageMatrix(
+            [bitset_indices(self.sentence_coverage[idx]) if self.use_bitsets
+             else sorted(self.sentence_coverage[idx]) for idx in rows],
+            len(self.word_list)
+        )
+        # Sentences already selected (forced by the reduction) are kept
+        base = [s['unique_index'] for s in self.selected_sentences]
+        coverable = sorted(w for w in self.coverage_map if w in self.uncovered_words)
+        
+        # Words still needed for the coverage target; all coverable words if
+        # the target asks for more than can be covered
+        target = self.config.min_coverage_percent * len(self.word_list)
+        covered = len(self.word_list) - len(self.uncovered_words) - len(self.set_aside_words)
+        need = max(0, min(math.ceil(target / 100) - covered, len(coverable)))
+        while need > 0 and (covered + need - 1) * 100 >= target:
+            need -= 1
+        while need < len(coverable) and (covered + need) * 100 < target:
+            need += 1
+        partial = need < len(coverable)
+        
+        # Warm start: greedy to the same target, without sentence or iteration limit
+        limit = len(base) + len(rows)
+        config, self.config = self.config, replace(
+            self.config, max_sentences=limit, max_iterations=limit,
+            min_coverage_percent=self.config.min_coverage_percent if partial else 100.0)
+        try:
+            self._optimize_greedy()
+        finally:
+            self.config = config
+        self.stop_reason = ""
+        
+        # Budget spent before the search could start: keep the greedy selection
+        time_limit = self.config.exact_time_limit
+        if self.deadline is not None:
+            time_limit = min(time_limit, self.deadline - time.time())
+        reached = (self._target_reached() if partial
+                   else self.uncovered_words.isdisjoint(coverable))
+        if time_limit <= 0 or not reached:
+            self.stop_reason = "time budget"
+            self._apply_selection([sel['unique_index'] for sel in self.selected_sentences])
+            return
+        
+        incumbent = [row_of[as_key(self.sentence_coverage[sel['unique_index']])]
+                     for sel in self.selected_sentences[len(base):]]
+        greedy_size = len(self.selected_sentences)
+        
+        if partial:
+            solution = solve_partial_cover(matrix, coverable, need, incumbent, time_limit)
+        else:
+            solution = solve_set_cover(matrix, coverable, incumbent, time_limit)
+        best_size = len(base) + len(solution.selected)
+        
+        remaining = self._apply_selection(base + [rows[row] for row in solution.selected])
+        truncated = bool(remaining) and not (self._target_reached()
+                                             or self.uncovered_words.isdisjoint(coverable))
+        if not solution.optimal and time_limit < self.config.exact_time_limit:
+            self.stop_reason = "time budget"
+        if partial and self._target_reached():
+            self.stop_reason = "coverage target"
+        if truncated:
+            print(f"  ⚠️  Minimum cover needs {best_size} sentences, "
+                  f"keeping the first {self.config.max_sentences}")
+        
+        self.exact_stats = {
+            'greedy_sentences': greedy_size,
+            'lower_bound': len(base) + solution.lower_bound,
+            'target_words': covered + need,  # Words the search had to cover
+            'truncated': truncated,  # Cut to max_sentences, short of the target
+            'nodes': solution.nodes,
+            'time': round(solution.time, 2)
+        }
+        self._update_exact_stats()
+        stats = self.exact_stats
+        status = ("optimal" if stats['optimal']
+                  else f"gap {stats['gap']} ({stats['gap_percent']}%)")
+        print(f"✓ Branch and bound: {stats['best_sentences']} sentences (greedy {greedy_size}) for "
+              f"{stats['target_words']} words, lower bound {stats['lower_bound']}, {status}, "
+              f"{solution.nodes} nodes in {solution.time:.1f}s")
+    
+    def _update_exact_stats(self):
+        """Describe the current selection in exact_stats (also after local search)"""
+        stats = self.exact_stats
+        size = len(self.selected_sentences)
+        stats['best_sentences'] = size
+        stats['gap'] = size - stats['lower_bound']
+        stats['gap_percent'] = round(stats['gap'] / max(size, 1) * 100, 2)
+        stats['optimal'] = stats['gap'] <= 0 and not stats['truncated']
+    
+    def _optimize_portfolio(self):
+        """
+        Run greedy in-process as the incumbent, then every other PORTFOLIO
+        contestant from the current selection in worker processes (see
+        _run_in_workers), and keep the best selection
+        """
+        contestants = [(algorithm, overrides) for algorithm, overrides in self.PORTFOLIO
+                       if (algorithm, overrides) != ('greedy', {})]
+        if any(algorithm in ("portfolio", "grasp") for algorithm, _ in contestants):
+            raise ValueError("Portfolio contestants must be single algorithms")
+        labels = ['greedy'] + [algorithm + (f"({', '.join(f'{k}={v}' for k, v in overrides.items())})"
+                                            if overrides else "")
+                               for algorithm, overrides in contestants]
+        print(f"Running portfolio of {len(labels)} contestants...")
+        
+        incumbent = self._run_incumbent(lambda: self._run_algorithm('greedy'))
+        outcomes = [incumbent] + self._run_in_workers('Optimizing (Portfolio)...', _run_contestant,
+                                                      contestants)
+        winner = self._replay_best(outcomes)
+        
+        self.portfolio_stats = {
+            'winner': labels[winner],
+            'contestants': [{
+                'label': label,
+                'sentences': len(outcome['indices']),
+                'words_covered': outcome['words_covered'],
+                'stop_reason': outcome['stop_reason'],
+                'time': outcome['time']
+            } for label, outcome in zip(labels, outcomes) if outcome is not None]
+        }
+        for stats in self.portfolio_stats['contestants']:
+            print(f"  {stats['label']}: {stats['sentences']} sentences, "
+                  f"{stats['words_covered']} words in {stats['time']}s")
+        print(f"✓ Portfolio winner: {labels[winner]}")
+    
+    def _optimize_grasp(self):
+        """
+        GRASP multi-start: a deterministic greedy start in-process as the
+        incumbent, then config.grasp_starts randomized greedy constructions
+        (seeds grasp_seed, grasp_seed + 1, ...), each followed by local
+        search, spread over worker processes. Each start depends only on its
+        seed, so results are reproducible whatever the number of processes,
+        unless the time budget cuts the run short
+        """
+        seeds = [self.config.grasp_seed + i for i in range(max(1, self.config.grasp_starts))]
+        print(f"Running GRASP ({len(seeds)} starts, top {self.config.grasp_top_k})...")
+        
+        incumbent = self._run_incumbent(self._run_greedy_start)
+        outcomes = [incumbent] + self._run_in_workers('Optimizing (GRASP)...', _run_grasp_start,
+                                                      [(seed,) for seed in seeds])
+        best = self._replay_best(outcomes)
+        
+        sizes = {seed: len(outcome['indices']) for seed, outcome in zip(seeds, outcomes[1:])
+                 if outcome is not None}
+        self.grasp_stats = {
+            'starts': len(seeds),
+            'completed': len(sizes),
+            'greedy_sentences': len(incumbent['indices']),
+            'best_seed': seeds[best - 1] if best else None,  # None: the greedy start won
+            'best_sentences': len(self.selected_sentences),
+            'mean_sentences': round(sum(sizes.values()) / len(sizes), 1) if sizes else 0.0,
+            'sizes': sizes
+        }
+        print(f"✓ GRASP: best of greedy and {len(sizes)} starts is "
+              f"{'greedy' if not best else f'seed {seeds[best - 1]}'} with "
+              f"{len(self.selected_sentences)} sentences (mean {self.grasp_stats['mean_sentences']})")
+    
+    def _run_greedy_start(self):
+        """GRASP's deterministic start: plain greedy, then local search"""
+        self._optimize_greedy()
+        if self.selected_sentences:
+            self._improve_selection()
+    
+    def _optimize_randomized_greedy(self, rng: random.Random):
+        """
+        Greedy construction that picks uniformly among the config.grasp_top_k
+        sentences with the largest gains (top_k=1 is plain greedy). The lazy
+        heap still works: entries whose bound is exact when popped are the
+        true top gains, since no remaining bound exceeds them
+        """
+        top_k = max(1, self.config.grasp_top_k)
+        size = self._size
+        coverage = self.sentence_coverage
+        
+        uncovered = self._uncovered()
+        heap = []
+        for idx, covered in enumerate(coverage):
+            gain = size(covered & uncovered)
+            if gain and idx not in self.selected_indices:
+                heap.append((-gain, idx))
+        heapq.heapify(heap)
+        
+        while (self.uncovered_words and len(self.selected_sentences) < self.config.max_sentences
+               and not self._should_stop()):
+            uncovered = self._uncovered()
+            candidates = []
+            while heap and len(candidates) < top_k:
+                neg_gain, idx = heapq.heappop(heap)
+                gain = size(coverage[idx] & uncovered)
+                if gain == -neg_gain:
+                    candidates.append((neg_gain, idx))
+                elif gain:
+                    heapq.heappush(heap, (-gain, idx))
+            if not candidates:
+                break
+            
+            _, best_idx = candidates.pop(rng.randrange(len(candidates)))
+            for entry in candidates:
+                heapq.heappush(heap, entry)
+            self._add_sentence(best_idx, coverage[best_idx] & uncovered)
+    
+    def _run_incumbent(self, run: Callable) -> Dict:
+        """
+        Outcome of run() from the current selection, computed in-process so
+        that a result exists however little of the time budget is left for
+        the workers. The selection is put back afterwards
+        """
+        start_time = time.time()
+        base = [s['unique_index'] for s in self.selected_sentences]
+        with contextlib.redirect_stdout(io.StringIO()):
+            run()
+        outcome = _job_outcome(self, start_time)
+        self.stop_reason, self.exact_stats, self.improvement_stats = "", {}, {}
+        self._apply_selection(base)
+        return outcome
+    
+    def _run_in_workers(self, stage: str, task: Callable, jobs: Sequence[Tuple]) -> List[Optional[Dict]]:
+        """
+        Outcomes of task(*job) for every job, run in up to config.max_workers
+        processes that read one shared-memory copy of the coverage and start
+        from the current selection (in-process when parallel processing is
+        off). Once the time budget is spent, jobs not yet started are skipped
+        and their outcome is None
+        """
+        global _worker_block, _worker_optimizer
+        if not jobs or (self.deadline is not None and time.time() >= self.deadline):
+            return [None] * len(jobs)
+        
+        n_process = min(max(1, self.config.max_workers), len(jobs))
+        if not self.config.parallel_processing:
+            n_process = 1
+        
+        matrix = self.coverage_matrix
+        if matrix is None:
+            rows = [bitset_indices(covered) if self.use_bitsets else covered
+                    for covered in self.sentence_coverage]
+            matrix = CoverageMatrix(rows, len(self.word_list))
+        shared, layout = share_matrix(matrix)
+        # One process per job: no nested beam search pools. Worker rows are
+        # bitsets: compact, popcount gains, and beam search uses them as they are
+        config = replace(self.config, parallel_processing=False, coverage_format='bitset')
+        initargs = (shared.name, layout, self.word_list, config,
+                    [s['unique_index'] for s in self.selected_sentences], self.set_aside_words, self.deadline)
+        outcomes = [None] * len(jobs)
+        
+        def record(position: int, outcome: Dict):
+            outcomes[position] = outcome
+            self._report_progress(stage, sum(o is not None for o in outcomes), len(jobs),
+                                  outcome['words_covered'], len(outcome['indices']))
+        
+        try:
+            if n_process > 1:
+                print(f"  {len(jobs)} jobs on {n_process} processes")
+                with ProcessPoolExecutor(max_workers=n_process, initializer=_init_selection_worker,
+                                         initargs=initargs) as pool:
+                    futures = {pool.submit(task, *job): position for position, job in enumerate(jobs)}
+                    for future in as_completed(futures):
+                        if future.cancelled():
+                            continue
+                        record(futures[future], future.result())
+                        if self.deadline is not None and time.time() >= self.deadline:
+                            for pending in futures:
+                                pending.cancel()
+            else:
+                _init_selection_worker(*initargs)
+                for position, job in enumerate(jobs):
+                    if self.deadline is not None and time.time() >= self.deadline:
+                        break
+                    record(position, task(*job))
+        finally:
+            # The in-process worker's views must go before its block closes
+            _worker_optimizer = None
+            if _worker_block is not None:
+                _worker_block.close()
+                _worker_block = None
+            shared.close()
+            shared.unlink()
+        return outcomes
+    
+    def _replay_best(self, outcomes: List[Optional[Dict]]) -> int:
+        """
+        Make the best outcome the current selection and return its position:
+        the smallest selection reaching the coverage target, or if none does,
+        the one covering the most words (ties: lowest position)
+        """
+        n_words = len(self.word_list)
+        
+        def rank(position):
+            outcome = outcomes[position]
+            reached = outcome['words_covered'] * 100 >= self.config.min_coverage_percent * n_words
+            return (not reached, 0 if reached else -outcome['words_covered'],
+                    len(outcome['indices']), -outcome['words_covered'], position)
+        
+        best = min((p for p, outcome in enumerate(outcomes) if outcome is not None), key=rank)
+        
+        # Replay the selection in its own order
+        self._reset_selection()
+        for sent_idx in outcomes[best]['indices']:
+            self._add_sentence(sent_idx, self.sentence_coverage[sent_idx] & self._uncovered())
+        self.stop_reason = outcomes[best]['stop_reason']
+        if any(outcome is None or outcome['stop_reason'] == "time budget" for outcome in outcomes):
+            self.stop_reason = "time budget"  # Jobs were skipped or cut short
+        self.exact_stats = outcomes[best]['exact_stats']
+        self.improvement_stats = outcomes[best]['improvement_stats']
+        return best
+    
+    def _reduce_instance(self) -> List:
+        """
+        Select sentences that are some word's only cover, hide sentences whose
+        remaining words another sentence also covers, and set aside words no
+        sentence contains (see core.reduction). Returns the full coverage for
+        _restore_instance
+        """
+        start_time = time.time()
+        if self.use_bitsets:
+            words_of = lambda idx: bitset_indices(self.sentence_coverage[idx])
+        else:
+            words_of = lambda idx: self.sentence_coverage[idx]
+        # At most half of the time budget, the rest is for the algorithm
+        deadline = None
+        if self.deadline is not None:
+            deadline = (time.time() + self.deadline) / 2
+        # Sole covers are in every full cover, but with a partial coverage target
+        # or a sentence limit that can bind they may crowd out better picks.
+        # Each pick covers a new word, so no selection outgrows the coverable words
+        coverable = sum(1 for word_idx in self.uncovered_words if self.coverage_map.get(word_idx))
+        force = (self.config.min_coverage_percent >= 100.0 and
+                 min(self.config.max_sentences, self.config.max_iterations) >= coverable)
+        reduction = reduce_instance(len(self.sentence_coverage), words_of, self.uncovered_words,
+                                    self.coverage_map, deadline, force_sole_covers=force)
+        
+        # Dropped sentences stay in place (indices are unchanged) but cover nothing
+        full_coverage, dropped = self.sentence_coverage, reduction.dropped
+        if dropped:
+            empty = 0 if self.use_bitsets else set()
+            self.sentence_coverage = [empty if idx in dropped else covered
+                                      for idx, covered in enumerate(full_coverage)]
+            self.coverage_map = {word_idx: [idx for idx in sentences if idx not in dropped]
+                                 for word_idx, sentences in self.coverage_map.items()}
+            if self.coverage_matrix is not None:
+                self._build_coverage_matrix()
+        
+        self.set_aside_words = reduction.uncoverable
+        self._apply_selection(reduction.forced)
+        
+        self.reduction_stats = {
+            'forced_sentences': len(reduction.forced),
+            'dropped_sentences': len(reduction.dropped),
+            'uncoverable_words': len(reduction.uncoverable),
+            'rounds': reduction.rounds,
+            'remaining_sentences': reduction.remaining_sentences,
+            'remaining_words': reduction.remaining_words,
+            'time': round(time.time() - start_time, 3)
+        }
+        print(f"✓ Reduced to {reduction.remaining_sentences}/{len(full_coverage)} sentences and "
+              f"{reduction.remaining_words}/{len(self.word_list)} words: "
+              f"{len(reduction.forced)} forced, {len(reduction.dropped)} dropped, "
+              f"{len(reduction.uncoverable)} uncoverable ({reduction.rounds} rounds, "
+              f"{self.reduction_stats['time']}s)")
+        return full_coverage
+    
+    def _restore_instance(self, full_coverage: List):
+        """Bring back the dropped sentences and the set-aside words"""
+        self.sentence_coverage = full_coverage
+        self.uncovered_words |= self.set_aside_words
+        if self.use_bitsets:
+            self.uncovered_bits |= to_bitset(self.set_aside_words)
+        self.set_aside_words = set()
+    
+    def _improve_selection(self):
+        """
+        Drop sentences made redundant by later picks, then replace groups of
+        sentences by one that covers their words (see core.local_search).
+        Coverage is unchanged
+        """
+        start_time = time.time()
+        before = [s['unique_index'] for s in self.selected_sentences]
+        if self.use_bitsets:
+            words_of = lambda idx: bitset_indices(self.sentence_coverage[idx])
+        else:
+            words_of = lambda idx: self.sentence_coverage[idx]
+        
+        improved, stats = improve_cover(before, words_of, self.coverage_map, len(self.word_list),
+                                        self.deadline)
+        if len(improved) < len(before):
+            self._apply_selection(improved)
+        
+        stats.update(before=len(before), after=len(self.selected_sentences),
+                     time=round(time.time() - start_time, 3))
+        self.improvement_stats = stats
+        print(f"✓ Local search: {stats['before']} → {stats['after']} sentences "
+              f"({stats['redundant_removed']} redundant, {stats['swaps']} swaps) in {stats['time']}s")
+    
+    def _apply_selection(self, indices: List[int]) -> List[int]:
+        """
+        Replace the selection with the given sentences, most new words first,
+        up to config.max_sentences or the coverage target; returns the
+        sentences that were left out
+        """
+        self._reset_selection()
+        size = self._size
+        uncovered = self._uncovered()
+        
+        # Lazy greedy order over the given sentences (ties: lowest index)
+        heap = [(-size(self.sentence_coverage[idx] & uncovered), idx) for idx in indices]
+        heapq.heapify(heap)
+        while (heap and len(self.selected_sentences) < self.config.max_sentences
+               and not self._target_reached()):
+            neg_gain, idx = heap[0]
+            new_coverage = self.sentence_coverage[idx] & self._uncovered()
+            if size(new_coverage) == -neg_gain:
+                heapq.heappop(heap)
+                self._add_sentence(idx, new_coverage)
+            else:
+                heapq.heapreplace(heap, (-size(new_coverage), idx))
+        return [idx for _, idx in sorted(heap, key=lambda entry: entry[1])]
+    
+    def _expand_beam(self, beam: List[Tuple], coverage: List[int], k: int,
+                     pool: Optional[ProcessPoolExecutor],
+                     chunks: List[Tuple[int, int]]) -> List[List[Tuple[int, int]]]:
+        """Best k (-gain, sentence index) expansions of every beam state"""
+        if pool is None:
+            return [_beam_candidates(uncovered, 0, len(coverage), k, coverage)
+                    for _, _, uncovered in beam]
+        
+        futures = [[pool.submit(_beam_candidates, uncovered, start, stop, k)
+                    for start, stop in chunks]
+                   for _, _, uncovered in beam]
+        return [heapq.nsmallest(k, chain.from_iterable(f.result() for f in state_futures))
+                for state_futures in futures]
+    
+    def _target_reached(self) -> bool:
+        """Whether the selection covers config.min_coverage_percent of the word list"""
+        covered = len(self.word_list) - len(self.uncovered_words) - len(self.set_aside_words)
+        return covered * 100 >= self.config.min_coverage_percent * len(self.word_list)
+    
+    def _should_stop(self) -> bool:
+        """
+        Checked before each step of every algorithm: the coverage target is
+        met, the time budget is spent or max_iterations sentences are
+        selected. The selection so far is always a valid result
+        """
+        if self._target_reached():
+            self.stop_reason = "coverage target"
+        elif self.deadline is not None and time.time() >= self.deadline:
+            self.stop_reason = "time budget"
+        elif len(self.selected_sentences) >= self.config.max_iterations:
+            self.stop_reason = "max iterations"
+        return bool(self.stop_reason)
+    
     def _add_sentence(self, sent_idx: int, new_coverage: Set[int]):
-        """Add sentence to selection"""
+        """Add sentence to selection (new_coverage is a bitset in bitset mode)"""
+        new_words = bitset_indices(new_coverage) if self.use_bitsets else new_coverage
         self.selected_sentences.append({
-            'index': sent_idx,
+            'index': self._original_rows(sent_idx)[0],  # Input row, as in coverage_map
+            'unique_index': sent_idx,  # Position in self.sentences after deduplication
+            'original_rows': self._original_rows(sent_idx),
             'sentence': self.sentences[sent_idx],
-            'words_covered': [self.word_list[w]['french'] for w in new_coverage],
-            'new_words_count': len(new_coverage),
-            'total_words': len(self.sentence_coverage[sent_idx])
+            'words_covered': [self.word_list[w]['french'] for w in new_words],
+            'new_words_count': len(new_words),
+            'total_words': self._size(self.sentence_coverage[sent_idx])
         })
-        self.uncovered_words -= new_coverage
+        self.selected_indices.add(sent_idx)
+        self.uncovered_words.difference_update(new_words)
+        if self.use_bitsets:
+            self.uncovered_bits &= ~new_coverage
+    
+    def _uncovered(self):
+        """Uncovered words in the same representation as sentence_coverage"""
+        return self.uncovered_bits if self.use_bitsets else self.uncovered_words
+    
+    def _original_rows(self, sent_idx: int) -> List[int]:
+        """Input rows a (possibly deduplicated) sentence stands for"""
+        if self.original_rows is None:
+            return [sent_idx]
+        return self.original_rows[sent_idx]
     
     def _is_already_selected(self, sent_idx: int) -> bool:
         """Check if sentence already selected"""
-        return any(s['index'] == sent_idx for s in self.selected_sentences)
+        return sent_idx in self.selected_indices
     
     def _report_progress(self, stage: str, current: int, total: int, 
                         words_covered: int, sentences_selected: int):
@@ -277,6 +1152,11 @@ class EnhancedSentenceOptimizer:
     
     def _build_results(self, processing_time: float, algorithm: str) -> OptimizationResult:
         """Build structured optimization results"""
+        if self.config.record_match_details:
+            explanations = self.explain_selection()
+            for sent_data in self.selected_sentences:
+                sent_data['matches'] = explanations[sent_data['unique_index']]
+        
         missing_words = [self.word_list[idx] for idx in self.uncovered_words]
         words_covered = len(self.word_list) - len(self.uncovered_words)
         coverage_percent = (words_covered / len(self.word_list)) * 100
@@ -293,20 +1173,35 @@ class EnhancedSentenceOptimizer:
             processing_time=round(processing_time, 2),
             coverage_map=self._build_coverage_map(),
             algorithm_used=algorithm,
-            iterations=len(self.selected_sentences)
+            iterations=len(self.selected_sentences),
+            dedup_stats=self.dedup_stats,
+            exact_stats=self.exact_stats,
+            improvement_stats=self.improvement_stats,
+            reduction_stats=self.reduction_stats,
+            portfolio_stats=self.portfolio_stats,
+            grasp_stats=self.grasp_stats,
+            stop_reason=self.stop_reason
         )
         
         self._print_summary(result)
         return result
     
+    def explain_selection(self) -> Dict[int, List[Dict]]:
+        """
+        Match highlights for every selected sentence, from the recorded analysis
+        pass (requires config.record_match_details)
+        """
+        return self.matcher.explain(s['unique_index'] for s in self.selected_sentences)
+    
     def _build_coverage_map(self) -> List[Dict]:
         """Build detailed coverage map"""
         coverage_data = []
-        selected_indices = {s['index'] for s in self.selected_sentences}
+        selected_indices = {s['unique_index'] for s in self.selected_sentences}
         
         for idx, word in enumerate(self.word_list):
             sentence_indices = self.coverage_map.get(idx, [])
-            in_selected = [i for i in sentence_indices if i in selected_indices]
+            in_selected = [self._original_rows(i)[0] for i in sentence_indices
+                           if i in selected_indices]
             
             coverage_data.append({
                 'french': word['french'],
@@ -0,0 +1,126 @@
+"""
+Instance reduction before optimization
+Classic set-cover reductions, applied until none changes anything: a word
+found in a single sentence forces that sentence (only valid when every word
+must be covered), a sentence whose remaining words all appear in another
+sentence is dropped, and words found in no sentence are set aside instead
+of being chased by the algorithms
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+@dataclass
+class Reduction:
+    """Outcome of reduce_instance"""
+    forced: List[int] = field(default_factory=list)  # Sentences every full cover contains
+    dropped: Set[int] = field(default_factory=set)  # Dominated or emptied sentences
+    uncoverable: Set[int] = field(default_factory=set)  # Words no sentence contains
+    rounds: int = 0
+    remaining_sentences: int = 0
+    remaining_words: int = 0
+
+
+# Dominance checks only look at sentences sharing a rare word; a sentence
+# whose rarest word is in more sentences than this is simply kept
+DOMINANCE_SCAN_LIMIT = 2000
+SUBSET_TEST_LIMIT = 32
+
+
+def reduce_instance(n_sentences: int, words_of: Callable[[int], Iterable[int]],
+                    uncovered: Iterable[int],
+                    coverage_map: Optional[Dict[int, List[int]]] = None,
+                    deadline: Optional[float] = None,
+                    force_sole_covers: bool = True) -> Reduction:
+    """
+    Reduce the problem of covering the uncovered words with the sentences
+    0..n_sentences-1. Dominance is judged on words still to cover, and of two
+    sentences with the same remaining words the lower index is kept.
+
+    coverage_map (word -> sentences containing it) saves rebuilding it from
+    words_of. At the deadline (a time.time() value) reduction stops; what it
+    found until then is still valid. Sole covers are only forced with
+    force_sole_covers: when a partial cover is enough, or the number of
+    sentences is capped, they can crowd out better picks
+    """
+    result = Reduction()
+    remaining = set(uncovered)
+    rows: Dict[int, Set[int]] = {}
+    for sent_idx in range(n_sentences):
+        if deadline is not None and not sent_idx % 4096 and time.time() >= deadline:
+            return Reduction(remaining_sentences=n_sentences, remaining_words=len(remaining))
+        row = remaining.intersection(words_of(sent_idx))
+        if row:
+            rows[sent_idx] = row
+        else:
+            result.dropped.add(sent_idx)
+
+    if coverage_map is not None:
+        postings = {w: set(coverage_map.get(w, ())) for w in remaining}
+    else:
+        postings = {w: set() for w in remaining}
+        for sent_idx, row in rows.items():
+            for w in row:
+                postings[w].add(sent_idx)
+
+    result.uncoverable = {w for w, sentences in postings.items() if not sentences}
+    remaining -= result.uncoverable
+    frequency = {w: len(sentences) for w, sentences in postings.items()}
+
+    def remove_sentence(sent_idx: int):
+        for w in rows.pop(sent_idx):
+            postings[w].discard(sent_idx)
+
+    # A sentence can only become dominated when its own row shrinks, so
+    # after the first round only those are checked again
+    unchecked = set(rows)
+    changed = True
+    while changed and not (deadline is not None and time.time() >= deadline):
+        changed = False
+        result.rounds += 1
+
+        # Sole covers: select them and forget the words they cover
+        if force_sole_covers:
+            for w in sorted(remaining):
+                if w in remaining and len(postings[w]) == 1:
+                    (sent_idx,) = postings[w]
+                    covered = rows[sent_idx]
+                    remove_sentence(sent_idx)
+                    result.forced.append(sent_idx)
+                    remaining -= covered
+                    for x in covered:
+                        for other in postings.pop(x):
+                            rows[other].discard(x)
+                            unchecked.add(other)
+                            if not rows[other]:
+                                del rows[other]
+                                result.dropped.add(other)
+                    changed = True
+
+        # Dominated sentences, smallest first. Candidates contain its rarest
+        # word (and its second rarest, if the rarest is common) and are then
+        # subset-tested; rarity is the initial sentence count, which is cheap
+        # to look up and only affects speed
+        for sent_idx in sorted(unchecked.intersection(rows), key=lambda s: (len(rows[s]), s)):
+            if deadline is not None and time.time() >= deadline:
+                break
+            row = rows[sent_idx]
+            order = sorted(row, key=frequency.__getitem__)
+            supersets = postings[order[0]]
+            if len(supersets) > DOMINANCE_SCAN_LIMIT:
+                continue
+            if len(supersets) > SUBSET_TEST_LIMIT and len(order) > 1:
+                supersets = supersets & postings[order[1]]
+            size = len(row)
+            if any(other != sent_idx and (len(rows[other]) > size or other < sent_idx)
+                   and row <= rows[other] for other in supersets):
+                remove_sentence(sent_idx)
+                result.dropped.add(sent_idx)
+                changed = True
+        unchecked.clear()
+
+    result.remaining_sentences = len(rows)
+    result.remaining_words = len(remaining)
+    return result
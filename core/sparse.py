@@ -0,0 +1,150 @@
+"""
+Sparse coverage matrix
+Sentence x word incidence matrix stored CSR-style in NumPy arrays, so the
+optimizer can compute every sentence's gain as one matrix-vector product
+with the uncovered-word mask instead of a Python set operation per sentence.
+The same arrays in shared memory hand the coverage to worker processes,
+which read columns from them without a private copy
+"""
+
+from collections.abc import Mapping, Sequence
+from itertools import chain
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from core.bitset import to_bitset
+
+
+class CoverageMatrix:
+    """
+    0/1 matrix with one row per sentence and one column per word
+    Row r's word indices are indices[offsets[r]:offsets[r + 1]]; a transposed
+    copy (column_offsets / column_rows) maps each word to its sentences
+    """
+
+    def __init__(self, rows: List[Iterable[int]], n_words: int):
+        row_sizes = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+        self.offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(row_sizes, out=self.offsets[1:])
+        self.indices = np.fromiter(chain.from_iterable(rows), dtype=np.int32,
+                                   count=int(self.offsets[-1]))
+        self.row_sizes = row_sizes
+        self.n_words = n_words
+
+        # Transpose: sentences of each word, ascending
+        order = np.argsort(self.indices, kind='stable')
+        self.column_rows = np.repeat(np.arange(len(rows), dtype=np.int32), row_sizes)[order]
+        self.column_offsets = np.zeros(n_words + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=n_words), out=self.column_offsets[1:])
+
+    def __len__(self) -> int:
+        return len(self.row_sizes)
+
+    def dot(self, vector: np.ndarray) -> np.ndarray:
+        """Matrix-vector product: per-sentence sum of vector over its words"""
+        sums = np.zeros(len(self.indices) + 1, dtype=vector.dtype)
+        np.cumsum(vector[self.indices], out=sums[1:])
+        return sums[self.offsets[1:]] - sums[self.offsets[:-1]]
+
+    def transpose_dot(self, vector: np.ndarray) -> np.ndarray:
+        """Transposed product: per-word sum of vector over its sentences"""
+        sums = np.zeros(len(self.column_rows) + 1, dtype=vector.dtype)
+        np.cumsum(vector[self.column_rows], out=sums[1:])
+        return sums[self.column_offsets[1:]] - sums[self.column_offsets[:-1]]
+
+    def subtract_columns(self, target: np.ndarray, word_indices: Iterable[int]):
+        """
+        target -= matrix @ delta, where delta is 1 at word_indices: the sparse
+        update of a gain vector after those words become covered
+        """
+        offsets = self.column_offsets
+        rows = [self.column_rows[offsets[w]:offsets[w + 1]] for w in word_indices]
+        if rows:
+            np.subtract.at(target, np.concatenate(rows), 1)
+
+
+class CoverageRows(Sequence):
+    """
+    A matrix's rows as sentence_coverage entries (word index sets, or bitsets),
+    built on access instead of stored
+    """
+
+    def __init__(self, matrix: CoverageMatrix, as_bitsets: bool = False):
+        self.matrix = matrix
+        self.as_bitsets = as_bitsets
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def __getitem__(self, row: int):
+        if not 0 <= row < len(self.matrix):
+            raise IndexError(row)
+        offsets = self.matrix.offsets
+        words = self.matrix.indices[offsets[row]:offsets[row + 1]].tolist()
+        return to_bitset(words) if self.as_bitsets else set(words)
+
+
+class CoverageColumns(Mapping):
+    """A matrix's columns as a coverage_map: word -> sentences, for words in any"""
+
+    def __init__(self, matrix: CoverageMatrix):
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(np.diff(self.matrix.column_offsets)))
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(np.flatnonzero(np.diff(self.matrix.column_offsets)).tolist())
+
+    def __getitem__(self, word: int) -> List[int]:
+        offsets = self.matrix.column_offsets
+        if not 0 <= word < self.matrix.n_words or offsets[word] == offsets[word + 1]:
+            raise KeyError(word)
+        return self.matrix.column_rows[offsets[word]:offsets[word + 1]].tolist()
+
+
+def share_matrix(matrix: CoverageMatrix) -> Tuple[SharedMemory, Tuple[int, int, int]]:
+    """
+    Copy a matrix (rows and transpose) into one shared memory block that
+    worker processes attach to by name, instead of each receiving a pickled
+    copy. Returns (block, layout); the caller closes and unlinks the block
+    """
+    layout = (len(matrix), matrix.n_words, len(matrix.indices))
+    block = SharedMemory(create=True, size=_block_size(*layout))
+    for shared, array in zip(_shared_arrays(block, *layout),
+                             (matrix.offsets, matrix.column_offsets, matrix.indices, matrix.column_rows)):
+        shared[:] = array
+    return block, layout
+
+
+def attach_matrix(name: str, layout: Tuple[int, int, int]) -> Tuple[SharedMemory, CoverageMatrix]:
+    """
+    Matrix stored by share_matrix, as views over the block with the given
+    name; the block must stay open while the matrix is in use
+    """
+    block = SharedMemory(name=name)
+    offsets, column_offsets, indices, column_rows = _shared_arrays(block, *layout)
+    matrix = CoverageMatrix.__new__(CoverageMatrix)
+    matrix.offsets, matrix.indices = offsets, indices
+    matrix.column_offsets, matrix.column_rows = column_offsets, column_rows
+    matrix.row_sizes = np.diff(offsets)
+    matrix.n_words = layout[1]
+    return block, matrix
+
+
+def _block_size(n_rows: int, n_words: int, n_values: int) -> int:
+    """Bytes of a share_matrix block"""
+    return max(1, (n_rows + n_words + 2) * 8 + n_values * 8)
+
+
+def _shared_arrays(block: SharedMemory, n_rows: int, n_words: int,
+                   n_values: int) -> Tuple[np.ndarray, ...]:
+    """Views over a share_matrix block: int64 offsets and column offsets, then int32 indices and column rows"""
+    arrays, position = [], 0
+    for size, dtype in ((n_rows + 1, np.int64), (n_words + 1, np.int64),
+                        (n_values, np.int32), (n_values, np.int32)):
+        arrays.append(np.ndarray((size,), dtype=dtype, buffer=block.buf, offset=position))
+        position += size * np.dtype(dtype).itemsize
+    return tuple(arrays)
@@ -0,0 +1,132 @@
+"""
+Preprocessed word-list cache
+Stores preprocessed words plus the built lookup tables in a compact,
+versioned binary file (JSON header + little-endian arrays, no pickle)
+"""
+
+import sys
+import json
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+MAGIC = b'FVOWLC'
+SCHEMA_VERSION = 1
+
+# Fields holding sets/tuples that JSON cannot represent directly
+_SET_FIELDS = ('tokens', 'lemmas')
+
+
+def _to_le_bytes(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le_bytes(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def flatten_trie(trie: Dict) -> Dict[str, array]:
+    """Flatten a nested token trie into parallel arrays (root is node 0)"""
+    parents, keys = array('i'), array('Q')
+    terminal_nodes, terminal_words = array('i'), array('i')
+
+    nodes = [trie]
+    node_id = 0
+    while node_id < len(nodes):
+        for key, child in nodes[node_id].items():
+            if key is None:
+                for word_idx in sorted(child):
+                    terminal_nodes.append(node_id)
+                    terminal_words.append(word_idx)
+            else:
+                parents.append(node_id)
+                keys.append(key)
+                nodes.append(child)
+        node_id += 1
+
+    return {'trie_parents': parents, 'trie_keys': keys,
+            'trie_terminal_nodes': terminal_nodes, 'trie_terminal_words': terminal_words}
+
+
+def unflatten_trie(arrays: Dict[str, array]) -> Dict:
+    """Rebuild the nested trie produced by flatten_trie"""
+    nodes = [{}]
+    for parent, key in zip(arrays['trie_parents'], arrays['trie_keys']):
+        child = {}
+        nodes[parent][key] = child
+        nodes.append(child)
+    for node_id, word_idx in zip(arrays['trie_terminal_nodes'], arrays['trie_terminal_words']):
+        nodes[node_id].setdefault(None, set()).add(word_idx)
+    return nodes[0]
+
+
+class WordListCache:
+    """Read/write one cache file: header metadata, word entries and arrays"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def save(self, word_list: List[Dict], arrays: Dict[str, array], meta: Dict):
+        """Write word entries, lookup arrays and free-form metadata"""
+        words = []
+        for word_data in word_list:
+            entry = dict(word_data)
+            for field in _SET_FIELDS:
+                entry[field] = sorted(entry.get(field, ()))
+            entry['sequences'] = [list(seq) for seq in entry.get('sequences', [])]
+            words.append(entry)
+
+        blobs = [(name, values.typecode, _to_le_bytes(values)) for name, values in arrays.items()]
+        header = json.dumps({
+            'schema': SCHEMA_VERSION,
+            'meta': meta,
+            'arrays': [[name, typecode, len(blob)] for name, typecode, blob in blobs],
+            'words': words
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<IQ', SCHEMA_VERSION, len(header)))
+            f.write(header)
+            for _, _, blob in blobs:
+                f.write(blob)
+        tmp_path.replace(self.path)  # Atomic, so readers never see a partial file
+
+    def load(self) -> Optional[Tuple[List[Dict], Dict[str, array], Dict]]:
+        """Return (word_list, arrays, meta), or None if missing/incompatible"""
+        if not self.path.exists():
+            return None
+
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        prefix = len(MAGIC) + struct.calcsize('<IQ')
+        if len(data) < prefix or not data.startswith(MAGIC):
+            return None
+        schema, header_len = struct.unpack_from('<IQ', data, len(MAGIC))
+        if schema != SCHEMA_VERSION:
+            return None
+
+        header = json.loads(data[prefix:prefix + header_len].decode('utf-8'))
+        offset = prefix + header_len
+        arrays = {}
+        for name, typecode, size in header['arrays']:
+            arrays[name] = _from_le_bytes(typecode, data[offset:offset + size])
+            offset += size
+
+        word_list = header['words']
+        for word_data in word_list:
+            for field in _SET_FIELDS:
+                word_data[field] = set(word_data[field])
+            word_data['sequences'] = [tuple(seq) for seq in word_data['sequences']]
+
+        return word_list, arrays, header['meta']
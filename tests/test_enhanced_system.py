@@ -67,17 +67,261 @@ def test_matcher():
         "Je parle français"
     ]
     results = matcher.batch_process_sentences(sentences)
+    assert results == [matcher.find_words_in_sentence(s) for s in sentences]
     print(f"  ✅ Batch processed {len(results)} sentences")
     
+    # Incremental word-list edits must match a full rebuild
+    config = OptimizerConfig(cache_enabled=False, incremental_updates=True)
+    matcher = EnhancedWordMatcher([dict(w) for w in test_words], config)
+    coverage = matcher.batch_process_sentences(sentences)
+    new_word = {'french': 'mon', 'english': 'my'}
+    matcher.update_coverage(coverage, mapping=matcher.remove_words([0]))
+    matcher.update_coverage(coverage, added=matcher.add_words([new_word]))
+    rebuilt = EnhancedWordMatcher([dict(w) for w in test_words[1:] + [new_word]], config)
+    assert coverage == rebuilt.batch_process_sentences(sentences)
+    print(f"  ✅ Incremental word-list update matches a full rebuild")
+    
+    # Lexicon mode keeps hyphenated words whole only if the word list knows them
+    config = OptimizerConfig(cache_enabled=False, incremental_updates=True, matching_mode='lexicon')
+    lexicon_words = [{'french': w, 'english': ''} for w in ['chat', 'grand', 'mère', 'arc']]
+    compounds = [{'french': w, 'english': ''} for w in ['grand-mère', 'arc-en-ciel']]
+    hyphenated = ["Ma grand-mère a un chat.", "Un arc-en-ciel.", "Grand-mères et arcs-en-ciel !"]
+    matcher = EnhancedWordMatcher([dict(w) for w in lexicon_words], config)
+    coverage = matcher.batch_process_sentences(hyphenated)
+    matcher.update_coverage(coverage, added=matcher.add_words(compounds))
+    rebuilt = EnhancedWordMatcher([dict(w) for w in lexicon_words + compounds], config)
+    assert coverage == rebuilt.batch_process_sentences(hyphenated)
+    matcher.update_coverage(coverage, mapping=matcher.remove_words([4]))
+    rebuilt = EnhancedWordMatcher([dict(w) for w in lexicon_words + compounds[1:]], config)
+    assert coverage == rebuilt.batch_process_sentences(hyphenated)
+    
+    # Removing the only phrase under a hyphenated first token prunes it from the trie
+    phrase_words = [{'french': w, 'english': ''} for w in ['grand', 'mère', 'grand-mère adorée']]
+    matcher = EnhancedWordMatcher([dict(w) for w in phrase_words], config)
+    coverage = matcher.batch_process_sentences(["Ma grand-mère est là."])
+    matcher.update_coverage(coverage, mapping=matcher.remove_words([2]))
+    rebuilt = EnhancedWordMatcher([dict(w) for w in phrase_words[:2]], config)
+    assert coverage == rebuilt.batch_process_sentences(["Ma grand-mère est là."]) == [{0, 1}]
+    assert matcher.phrase_trie == rebuilt.phrase_trie
+    print(f"  ✅ Lexicon-mode compound edits match a full rebuild")
+    
+    return True
+
+def test_analysis_cache():
+    """Test the persistent sentence analysis cache"""
+    print("\nTesting SentenceAnalysisCache...")
+    
+    import tempfile
+    from pathlib import Path
+    from core.analysis_cache import SentenceAnalysisCache
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'analysis.sqlite'
+        cache = SentenceAnalysisCache(db_path, 'model-a')
+        
+        # More texts than one SQLite query chunk, one without lemmas
+        texts = [f"phrase numéro {i}" for i in range(SentenceAnalysisCache._QUERY_CHUNK + 20)]
+        analyses = [((i, 2 ** 64 - 1 - i), (i + 1,) if i else ()) for i in range(len(texts))]
+        assert cache.fetch(texts[:3]) == [None, None, None]
+        cache.store(zip(texts, analyses))
+        assert cache.fetch(texts) == analyses
+        assert cache.fetch(texts[:2] + ["pas en cache"]) == analyses[:2] + [None]
+        assert (cache.hits, cache.misses) == (len(texts) + 2, 4)
+        print(f"  ✅ Round trip of {len(texts)} analyses")
+        
+        # A reopened cache serves the same entries, another fingerprint none
+        assert SentenceAnalysisCache(db_path, 'model-a').fetch(texts[:1]) == analyses[:1]
+        assert SentenceAnalysisCache(db_path, 'model-b').fetch(texts[:1]) == [None]
+        print(f"  ✅ Entries persist and are keyed by model fingerprint")
+    
+    return True
+
+def test_word_list_cache():
+    """Test the binary word-list cache and its key"""
+    print("\nTesting WordListCache...")
+    
+    import tempfile
+    from array import array
+    from pathlib import Path
+    from core.config import OptimizerConfig
+    from core.matcher import EnhancedWordMatcher
+    from core.word_cache import WordListCache, flatten_trie, unflatten_trie
+    
+    trie = {1: {2: {None: {0, 3}}, None: {1}}, 2 ** 64 - 1: {None: {2}}}
+    assert unflatten_trie(flatten_trie(trie)) == trie
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'words.cache'
+        assert WordListCache(path).load() is None
+        
+        words = [{'french': 'faire attention', 'english': 'to pay attention',
+                  'tokens': {'faire', 'attention'}, 'lemmas': {'faire'},
+                  'sequences': [('faire', 'attention')], 'is_phrase': True}]
+        arrays = dict(flatten_trie(trie), token_offsets=array('q', [0, 2]))
+        WordListCache(path).save(words, arrays, {'phrase_count': 1})
+        loaded_words, loaded_arrays, meta = WordListCache(path).load()
+        assert loaded_words == words and loaded_arrays == arrays
+        assert meta == {'phrase_count': 1}
+        print(f"  ✅ Words, arrays and metadata round trip")
+        
+        path.write_bytes(b'not a cache file')
+        assert WordListCache(path).load() is None
+        print(f"  ✅ Foreign files are ignored")
+        
+        # Warm start reproduces the cold-start matcher
+        test_words = [{'french': w, 'english': ''} for w in ['chat', 'faire attention', 'être']]
+        sentences = ["Le chat fait attention.", "Nous sommes là."]
+        config = OptimizerConfig(cache_folder=tmp)
+        cold = EnhancedWordMatcher([dict(w) for w in test_words], config)
+        assert len(list(Path(tmp).glob('*.wlc'))) == 1
+        warm = EnhancedWordMatcher([dict(w) for w in test_words], config)
+        assert warm.word_list == cold.word_list
+        assert warm.batch_process_sentences(sentences) == cold.batch_process_sentences(sentences)
+        print(f"  ✅ Warm start matches a cold start")
+        
+        # Settings that change tokens or lemmas change the cache key
+        keys = {
+            EnhancedWordMatcher([dict(w) for w in test_words], OptimizerConfig(
+                cache_folder=tmp, cache_enabled=False, **settings))._get_word_list_hash()
+            for settings in ({}, {'lemma_matching': False}, {'nlp_profile': 'lookup'},
+                             {'matching_mode': 'lexicon'})
+        }
+        assert len(keys) == 4
+        print(f"  ✅ Cache key changes with lemma_matching, the profile and the matching mode")
+        
+        # Warm start from a related list drops phrases missing from the current one
+        config = OptimizerConfig(cache_folder=tmp, matching_mode='lexicon')
+        EnhancedWordMatcher([{'french': w, 'english': ''}
+                             for w in ['grand', 'mère', 'grand-mère adorée']], config)
+        current = [{'french': w, 'english': ''} for w in ['grand', 'mère']]
+        warm = EnhancedWordMatcher([dict(w) for w in current], config)
+        cold = EnhancedWordMatcher([dict(w) for w in current],
+                                   OptimizerConfig(cache_enabled=False, matching_mode='lexicon'))
+        assert warm.phrase_trie == cold.phrase_trie
+        assert (warm.batch_process_sentences(["Ma grand-mère est là."])
+                == cold.batch_process_sentences(["Ma grand-mère est là."]) == [{0, 1}])
+        print(f"  ✅ Related-cache warm start matches a cold start")
+        
+        # Only caches of this version and model settings are warm-start bases,
+        # and caches of other settings do not use up the candidates
+        import io
+        import contextlib
+        
+        class NextVersionMatcher(EnhancedWordMatcher):
+            CACHE_VERSION = EnhancedWordMatcher.CACHE_VERSION + 1
+        
+        def warm_started(matcher_class, word_list):
+            log = io.StringIO()
+            with contextlib.redirect_stdout(log):
+                matcher_class([dict(w) for w in word_list], config)
+            return 'Updated cached word list' in log.getvalue()
+        
+        assert not warm_started(NextVersionMatcher, current + [{'french': 'chat', 'english': ''}])
+        for other in range(EnhancedWordMatcher.RELATED_CACHE_CANDIDATES):
+            EnhancedWordMatcher([{'french': f'autre{other}', 'english': ''}],
+                                OptimizerConfig(cache_folder=tmp))
+        assert warm_started(EnhancedWordMatcher, current + [{'french': 'chien', 'english': ''}])
+        print(f"  ✅ Warm starts skip other cache versions and model settings")
+    
+    return True
+
+def test_coverage_spill():
+    """Test streaming coverage and the spill file"""
+    print("\nTesting CoverageSpill...")
+    
+    import tempfile
+    from pathlib import Path
+    from core.config import OptimizerConfig
+    from core.corpus import CoverageSpillWriter, CoverageSpill, iter_sentences
+    from core.matcher import EnhancedWordMatcher
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'coverage.spill'
+        coverage = [{0, 5, 2 ** 32 - 1}, set(), {7}]
+        with CoverageSpillWriter(path) as writer:
+            writer.write_many(coverage)
+        assert writer.count == len(coverage)
+        assert list(CoverageSpill(path)) == list(enumerate(coverage))
+        print(f"  ✅ Spill file round trip")
+        
+        path.write_bytes(b'not a spill file')
+        try:
+            list(CoverageSpill(path))
+            assert False, "foreign files must be rejected"
+        except ValueError:
+            pass
+        
+        # Streaming in small chunks gives the batch coverage, also when spilled
+        words = [{'french': w, 'english': ''} for w in ['chat', 'maison', 'manger']]
+        sentences = ["Le chat mange.", "", "Une maison.", "Rien ici.", "Les chats et la maison."]
+        config = OptimizerConfig(cache_enabled=False, stream_chunk_size=2)
+        matcher = EnhancedWordMatcher(words, config)
+        expected = matcher.batch_process_sentences(sentences)
+        chunks = list(matcher.stream_coverage(iter(sentences), spill_path=path))
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert [item for chunk in chunks for item in chunk] == list(enumerate(expected))
+        assert list(CoverageSpill(path)) == list(enumerate(expected))
+        print(f"  ✅ Streamed and spilled coverage matches batch processing")
+        
+        # Sentence files are read from str or Path, whatever the extension's case
+        sentence_file = Path(tmp) / 'sentences.TSV'
+        sentence_file.write_text("Le chat mange.\tThe cat eats.\n\nUne maison.\tA house.\n",
+                                 encoding='utf-8')
+        expected = ["Le chat mange.", "Une maison."]
+        assert list(iter_sentences(sentence_file)) == list(iter_sentences(str(sentence_file))) == expected
+        print(f"  ✅ Sentence files read from Path objects")
+    
+    return True
+
+def test_deduplication():
+    """Test sentence normalization and duplicate removal"""
+    print("\nTesting sentence deduplication...")
+    
+    from core.config import OptimizerConfig
+    from core.corpus import deduplicate_sentences, normalize_sentence
+    from core.optimizer import EnhancedSentenceOptimizer
+    
+    assert normalize_sentence("  Le  CHAT dort !") == "le chat dort"
+    assert normalize_sentence("L\u2019élève, peut-être.") == "l'élève peut-être"
+    assert normalize_sentence("Cafe\u0301") == normalize_sentence("Café")
+    assert normalize_sentence("Le chat dort") != normalize_sentence("Les chats dorment")
+    print(f"  ✅ Normalization folds case, punctuation, spacing and Unicode forms")
+    
+    sentences = ["Le chat dort.", "Bonjour mon ami", "le chat  dort !", "LE CHAT DORT", "Bonjour mon ami"]
+    corpus = deduplicate_sentences(sentences)
+    assert corpus.sentences == ["Le chat dort.", "Bonjour mon ami"]
+    assert corpus.original_rows == [[0, 2, 3], [1, 4]]
+    assert corpus.stats() == {'input_sentences': 5, 'unique_sentences': 2,
+                              'duplicates_removed': 3, 'saved_percent': 60.0}
+    assert deduplicate_sentences([]).stats()['saved_percent'] == 0.0
+    print(f"  ✅ Duplicates grouped under their first row")
+    
+    # Selected sentences and the coverage map both refer to input rows
+    words = [{'french': w, 'english': ''} for w in ['chat', 'ami', 'maison']]
+    sentences = ["Bonjour mon ami", "Bonjour mon ami !", "La maison.", "Le chat dort.", "la maison"]
+    for dedup in (True, False):
+        config = OptimizerConfig(cache_enabled=False, deduplicate_sentences=dedup,
+                                 min_coverage_percent=100.0)
+        optimizer = EnhancedSentenceOptimizer(words, sentences, config)
+        result = optimizer.optimize(algorithm='greedy')
+        rows = sorted(s['index'] for s in result.selected_sentences)
+        assert rows == [0, 2, 3]
+        for sent_data in result.selected_sentences:
+            assert optimizer.sentences[sent_data['unique_index']] == sentences[sent_data['index']]
+        assert sorted(i for w in result.coverage_map for i in w['sentence_indices']) == rows
+    assert result.dedup_stats == {}
+    print(f"  ✅ Selection indices and coverage map agree with and without deduplication")
+    
     return True
 
 def test_optimizer():
-    """Test the enhanced optimizer with all three algorithms"""
+    """Test the enhanced optimizer with all six algorithms"""
     print("\nTesting EnhancedSentenceOptimizer...")
     
     from core.config import OptimizerConfig
     from core.matcher import EnhancedWordMatcher
     from core.optimizer import EnhancedSentenceOptimizer
+    from core.sparse import CoverageMatrix, CoverageRows, CoverageColumns, share_matrix, attach_matrix
     
     # Test data in expected format
     words = [
@@ -98,7 +342,7 @@ def test_optimizer():
         "Mon chat mange dans la maison.",
     ]
     
-    algorithms = ['greedy', 'weighted_greedy', 'beam_search']
+    algorithms = ['greedy', 'weighted_greedy', 'beam_search', 'exact', 'portfolio', 'grasp']
     
     for algo in algorithms:
         config = OptimizerConfig(algorithm=algo, cache_enabled=False)
@@ -112,6 +356,193 @@ def test_optimizer():
         print(f"    Covered: {result.words_covered}/{result.total_words} words")
         print(f"    Missing: {len(result.missing_words)} words")
         print(f"  ✅ {algo} algorithm works")
+        
+        # Bitset coverage must select exactly the same sentences
+        config = OptimizerConfig(algorithm=algo, cache_enabled=False, coverage_format='bitset')
+        bitset_result = EnhancedSentenceOptimizer(words, sentences, config).optimize(algorithm=algo)
+        assert ([s['index'] for s in bitset_result.selected_sentences] ==
+                [s['index'] for s in result.selected_sentences])
+        print(f"  ✅ {algo} bitset coverage gives the same selection")
+        
+        # Sparse matrix gains must select exactly the same sentences
+        config = OptimizerConfig(algorithm=algo, cache_enabled=False, gain_backend='sparse')
+        sparse_result = EnhancedSentenceOptimizer(words, sentences, config).optimize(algorithm=algo)
+        assert ([s['index'] for s in sparse_result.selected_sentences] ==
+                [s['index'] for s in result.selected_sentences])
+        print(f"  ✅ {algo} sparse gain backend gives the same selection")
+    
+    # Lazy greedy must pick exactly what a full rescan of every sentence picks
+    config = OptimizerConfig(algorithm='greedy', cache_enabled=False, min_coverage_percent=100.0,
+                             improve_selection=False, reduce_instance=False)
+    optimizer = EnhancedSentenceOptimizer(words, sentences, config)
+    lazy = [s['unique_index'] for s in optimizer.optimize(algorithm='greedy').selected_sentences]
+    uncovered, rescan = set(range(len(words))), []
+    while uncovered:
+        gains = [len(covered & uncovered) for covered in optimizer.sentence_coverage]
+        best = max(range(len(gains)), key=lambda i: (gains[i], -i))
+        if not gains[best]:
+            break
+        rescan.append(best)
+        uncovered -= optimizer.sentence_coverage[best]
+    assert lazy == rescan
+    print(f"  ✅ Lazy greedy matches a full rescan")
+    
+    # Local search keeps coverage and never adds sentences
+    config = OptimizerConfig(algorithm='greedy', cache_enabled=False, min_coverage_percent=100.0)
+    improved = EnhancedSentenceOptimizer(words, sentences, config).optimize(algorithm='greedy')
+    assert improved.words_covered == len(words) - len(uncovered)
+    assert improved.total_sentences <= len(rescan)
+    print(f"  ✅ Local search keeps coverage ({len(rescan)} → {improved.total_sentences} sentences)")
+    
+    # Reduction (on by default) keeps coverage and reports what it removed
+    config = OptimizerConfig(algorithm='greedy', cache_enabled=False, min_coverage_percent=100.0,
+                             improve_selection=False)
+    reduced = EnhancedSentenceOptimizer(words, sentences, config).optimize(algorithm='greedy')
+    assert reduced.words_covered == len(words) - len(uncovered)
+    assert reduced.reduction_stats['uncoverable_words'] == len(uncovered)
+    print(f"  ✅ Reduction keeps coverage ({reduced.reduction_stats['forced_sentences']} forced, "
+          f"{reduced.reduction_stats['dropped_sentences']} dropped)")
+    
+    # Sole covers are only forced when every word must be covered without a binding cap
+    coverage = [{0, 2, 3}, {7, 2}, {4, 6}, {8}, {1}, {7, 5, 1, 0}, {6, 3, 7, 1, 5}, {3, 5}, {7, 3, 6}]
+    capped = []
+    for reduce in (True, False):
+        config = OptimizerConfig(cache_enabled=False, max_sentences=3, reduce_instance=reduce)
+        optimizer = EnhancedSentenceOptimizer([{'french': f'mot{i}', 'english': ''} for i in range(9)],
+                                              [''] * len(coverage), config)
+        optimizer.sentence_coverage = [set(c) for c in coverage]
+        capped.append(optimizer.optimize(algorithm='greedy'))
+    assert capped[0].reduction_stats['forced_sentences'] == 0
+    assert capped[0].words_covered == capped[1].words_covered == 8
+    print(f"  ✅ Reduction forces nothing when max_sentences can bind")
+    
+    # Beam search honours width/depth and the sentence limit
+    config = OptimizerConfig(cache_enabled=False, beam_width=3, beam_depth=10, max_sentences=2)
+    result = EnhancedSentenceOptimizer(words, sentences, config).optimize(algorithm='beam_search')
+    assert result.total_sentences <= 2
+    print(f"  ✅ Beam search respects max_sentences")
+    
+    # Portfolio keeps the smallest contestant selection and reports every contestant
+    config = OptimizerConfig(cache_enabled=False, min_coverage_percent=100.0)
+    result = EnhancedSentenceOptimizer(words, sentences, config).optimize(algorithm='portfolio')
+    contestants = result.portfolio_stats['contestants']
+    assert len(contestants) == len(EnhancedSentenceOptimizer.PORTFOLIO)
+    assert result.total_sentences == min(c['sentences'] for c in contestants
+                                         if c['words_covered'] == result.words_covered)
+    print(f"  ✅ Portfolio picked {result.portfolio_stats['winner']} among {len(contestants)} contestants")
+    
+    # GRASP is reproducible from its seeds, in worker processes or not
+    selections = []
+    for parallel in (True, False):
+        config = OptimizerConfig(cache_enabled=False, min_coverage_percent=100.0, reduce_instance=False,
+                                 grasp_starts=4, grasp_seed=7, parallel_processing=parallel)
+        result = EnhancedSentenceOptimizer(words, sentences, config).optimize(algorithm='grasp')
+        selections.append([s['index'] for s in result.selected_sentences])
+        assert result.grasp_stats['completed'] == 4
+        assert result.total_sentences == min(result.grasp_stats['greedy_sentences'],
+                                             *result.grasp_stats['sizes'].values())
+    assert selections[0] == selections[1]
+    print(f"  ✅ GRASP is reproducible (best seed {result.grasp_stats['best_seed']})")
+    
+    # Workers read coverage and coverage map from the shared matrix, without a copy
+    optimizer = EnhancedSentenceOptimizer(words, sentences, OptimizerConfig(cache_enabled=False))
+    optimizer.optimize(algorithm='greedy')
+    block, layout = share_matrix(CoverageMatrix(optimizer.sentence_coverage, len(words)))
+    try:
+        attached, matrix = attach_matrix(block.name, layout)
+        assert list(CoverageRows(matrix)) == optimizer.sentence_coverage
+        assert dict(CoverageColumns(matrix)) == optimizer.coverage_map
+        del matrix
+        attached.close()
+    finally:
+        block.close()
+        block.unlink()
+    print(f"  ✅ Shared coverage matrix reads back the same coverage")
+    
+    # Exact solves to the coverage target and reports on the selection it returns
+    for percent in (50.0, 100.0):
+        config = OptimizerConfig(cache_enabled=False, min_coverage_percent=percent)
+        exact = EnhancedSentenceOptimizer(words, sentences, config).optimize(algorithm='exact')
+        greedy = EnhancedSentenceOptimizer(words, sentences, config).optimize(algorithm='greedy')
+        stats = exact.exact_stats
+        assert stats['best_sentences'] == exact.total_sentences <= greedy.total_sentences
+        assert stats['optimal'] and stats['lower_bound'] == exact.total_sentences
+    print(f"  ✅ Exact minimizes sentences for the coverage target")
+    
+    # Every algorithm stops at the coverage target or when the time budget runs out
+    for algo in algorithms:
+        config = OptimizerConfig(cache_enabled=False, min_coverage_percent=50.0)
+        result = EnhancedSentenceOptimizer(words, sentences, config).optimize(algorithm=algo)
+        assert result.coverage_percent >= 50.0 and result.stop_reason == 'coverage target'
+        
+        config = OptimizerConfig(cache_enabled=False, min_coverage_percent=100.0, time_budget=1e-9,
+                                 reduce_instance=False)
+        result = EnhancedSentenceOptimizer(words, sentences, config).optimize(algorithm=algo)
+        assert result.stop_reason == 'time budget'
+        assert result.words_covered == len(words) - len(result.missing_words)
+    print(f"  ✅ Coverage target and time budget stop every algorithm")
+    
+    # Word-list edits that cannot patch the coverage leave both word lists untouched
+    optimizer = EnhancedSentenceOptimizer(words[:2], sentences, OptimizerConfig(cache_enabled=False))
+    optimizer.optimize(algorithm='greedy')
+    try:
+        optimizer.update_words(added=[words[2]])
+        assert False, "update_words() needs incremental_updates"
+    except RuntimeError:
+        pass
+    assert len(optimizer.word_list) == len(optimizer.matcher.word_list) == 2
+    print(f"  ✅ update_words() refuses edits it cannot apply")
+    
+    # A tight budget still returns the in-process greedy incumbent, not an empty selection
+    import random
+    rng = random.Random(0)
+    many_words = [{'french': f'mot{i}', 'english': ''} for i in range(1000)]
+    weights = [1 / (i + 1) for i in range(len(many_words))]
+    coverage = [set(rng.choices(range(len(many_words)), weights, k=rng.randint(3, 12)))
+                for _ in range(20000)]
+    for algo in ('portfolio', 'grasp'):
+        config = OptimizerConfig(cache_enabled=False, min_coverage_percent=100.0, time_budget=1.0)
+        optimizer = EnhancedSentenceOptimizer(many_words, [''] * len(coverage), config)
+        optimizer.sentence_coverage = [set(c) for c in coverage]
+        result = optimizer.optimize(algorithm=algo)
+        assert result.total_sentences > 0 and result.words_covered > 0
+        print(f"  ✅ {algo} under a 1s budget: {result.total_sentences} sentences, "
+              f"{result.words_covered} words ({result.stop_reason or 'completed'})")
+    
+    return True
+
+def test_gain_backends():
+    """Benchmark the sparse gain backend against the set-based loops"""
+    print("\nBenchmarking gain backends...")
+    
+    import time
+    import random
+    from core.config import OptimizerConfig
+    from core.optimizer import EnhancedSentenceOptimizer
+    
+    # Synthetic coverage with Zipf-like word frequencies, like a real corpus
+    rng = random.Random(0)
+    words = [{'french': f'mot{i}', 'english': ''} for i in range(500)]
+    weights = [1 / (i + 1) for i in range(len(words))]
+    coverage = [set(rng.choices(range(len(words)), weights, k=rng.randint(3, 12)))
+                for _ in range(50000)]
+    
+    for algo in ('greedy', 'weighted_greedy'):
+        selections = {}
+        for backend in ('python', 'sparse'):
+            # Time the gain loops alone: no reduction, local search or early stop
+            config = OptimizerConfig(cache_enabled=False, gain_backend=backend, max_sentences=300,
+                                     reduce_instance=False, improve_selection=False,
+                                     min_coverage_percent=100.0)
+            optimizer = EnhancedSentenceOptimizer(words, [''] * len(coverage), config)
+            optimizer.sentence_coverage = [set(c) for c in coverage]
+            start_time = time.time()
+            result = optimizer.optimize(algorithm=algo)
+            elapsed = time.time() - start_time
+            selections[backend] = [s['index'] for s in result.selected_sentences]
+            print(f"  {algo} / {backend}: {elapsed*1000:.0f}ms, {result.total_sentences} sentences")
+        assert selections['python'] == selections['sparse']
+        print(f"  ✅ {algo} backends agree")
     
     return True
 
@@ -187,7 +618,12 @@ def main():
         ("Imports", test_imports),
         ("Configuration", test_config),
         ("Word Matcher", test_matcher),
+        ("Analysis Cache", test_analysis_cache),
+        ("Word List Cache", test_word_list_cache),
+        ("Coverage Spill", test_coverage_spill),
+        ("Deduplication", test_deduplication),
         ("Sentence Optimizer", test_optimizer),
+        ("Gain Backends", test_gain_backends),
         ("Web Interface", test_web_interface),
     ]
     
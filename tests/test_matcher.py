@@ -22,6 +22,7 @@ def test_basic_matching():
         {'french': 'maison', 'english': 'house', 'pos': 'noun'},
         {'french': 'aller', 'english': 'to go', 'pos': 'verb'},
         {'french': 'faire', 'english': 'to do/make', 'pos': 'verb'},
+        {'french': 'faire attention', 'english': 'to pay attention', 'pos': 'verb'},
     ]
     
     print(f"Testing with {len(word_list)} sample words...")
@@ -62,6 +63,11 @@ def test_basic_matching():
             'sentence': "Les chats sont dans la maison.",
             'expected': ['être', 'chat', 'maison'],
             'description': 'Plural forms'
+        },
+        {
+            'sentence': "Il fait attention au chat.",
+            'expected': ['faire attention', 'faire', 'chat'],
+            'description': 'Conjugated multi-word phrase'
         }
     ]
     
@@ -164,14 +170,187 @@ def test_performance():
     return True
 
 
+def test_fuzzy_performance():
+    """Benchmark the fuzzy tier against exact lookup on the same analyses"""
+    print()
+    print("=" * 60)
+    print("Fuzzy Matching Benchmark")
+    print("=" * 60)
+    print()
+    
+    import time
+    from core.config import OptimizerConfig
+    
+    word_list = [
+        {'french': 'élève', 'english': 'student', 'pos': 'noun'},
+        {'french': 'ordinateur', 'english': 'computer', 'pos': 'noun'},
+        {'french': 'attention', 'english': 'attention', 'pos': 'noun'},
+        {'french': 'maison', 'english': 'house', 'pos': 'noun'},
+        {'french': 'être', 'english': 'to be', 'pos': 'verb'},
+    ] + [
+        {'french': f'vocabulaire{i}', 'english': f'word{i}', 'pos': 'noun'}
+        for i in range(2000)
+    ]
+    
+    sentences = [
+        "L'eleve utilise son ordinatuer a la maison.",
+        "Il fait atention a ce qu'il dit.",
+        "Nous sommes dans une grande maison.",
+    ] * 100
+    
+    exact = WordMatcher([dict(w) for w in word_list], OptimizerConfig(cache_enabled=False))
+    fuzzy = WordMatcher([dict(w) for w in word_list],
+                        OptimizerConfig(cache_enabled=False, fuzzy_matching=True))
+    
+    # Time only the matching phase, on one shared spaCy analysis (best of
+    # several rounds, since one round takes about a millisecond)
+    analyses = [exact._analyze_doc(doc) for doc in exact.nlp.pipe(s.lower() for s in sentences)]
+    timings, results = {}, {}
+    for name, matcher in (('exact', exact), ('fuzzy', fuzzy)):
+        rounds = []
+        for _ in range(5):
+            start_time = time.perf_counter()
+            found = [matcher._match_analysis(a, s.lower()) for a, s in zip(analyses, sentences)]
+            rounds.append(time.perf_counter() - start_time)
+        timings[name], results[name] = min(rounds), found
+        print(f"  {name}: {timings[name]*1000:.1f}ms for {len(sentences)} sentences, "
+              f"{sum(len(f) for f in found)} matches")
+    
+    # The typos match only through the fuzzy tier; exact hits are kept
+    assert results['exact'][:3] == [{3}, set(), {3, 4}]
+    assert results['fuzzy'][:3] == [{0, 1, 3}, {2}, {3, 4}]
+    assert all(e <= f for e, f in zip(results['exact'], results['fuzzy']))
+    print("✓ 'eleve', 'ordinatuer' and 'atention' match only with fuzzy matching")
+    
+    factor = timings['fuzzy'] / max(timings['exact'], 1e-9)
+    assert factor <= 5, f"fuzzy matching costs {factor:.1f}x exact lookup"
+    print(f"✓ Fuzzy matching costs {factor:.1f}x exact lookup")
+    print()
+    
+    return True
+
+
+def test_explain():
+    """Check bulk match explanations against the batch coverage"""
+    print()
+    print("=" * 60)
+    print("Match Explanations")
+    print("=" * 60)
+    print()
+    
+    from core.config import OptimizerConfig
+    
+    word_list = [
+        {'french': w, 'english': '', 'pos': ''}
+        for w in ['être', 'un|une', 'faire attention', 'chat', 'maison', 'ordinateur']
+    ]
+    sentences = [
+        "Il fait attention au Chat.",
+        "Je suis une élève.",
+        "",
+        "Mon ordinatuer est dans la maison.",
+    ]
+    
+    matcher = WordMatcher([dict(w) for w in word_list], OptimizerConfig(cache_enabled=False))
+    matcher.batch_process_sentences(sentences)
+    try:
+        matcher.explain([0])
+        assert False, "explain() must require record_match_details"
+    except RuntimeError:
+        pass
+    
+    matcher = WordMatcher([dict(w) for w in word_list],
+                          OptimizerConfig(cache_enabled=False, record_match_details=True,
+                                          fuzzy_matching=True))
+    coverage = matcher.batch_process_sentences(sentences)
+    explanations = matcher.explain(range(len(sentences)))
+    
+    for idx, sentence in enumerate(sentences):
+        matches = explanations[idx]
+        assert {m['word_idx'] for m in matches} == coverage[idx]
+        for match in matches:
+            assert match['matched_form'] == sentence[match['start']:match['end']]
+            assert match['word'] == word_list[match['word_idx']]['french']
+    
+    types = {(idx, m['word']): (m['match_type'], m['matched_form'])
+             for idx, matches in explanations.items() for m in matches}
+    assert types[(0, 'faire attention')] == ('phrase', 'fait attention')
+    assert types[(0, 'chat')] == ('exact', 'Chat')
+    assert types[(1, 'être')] == ('lemma', 'suis')
+    assert types[(3, 'ordinateur')] == ('fuzzy', 'ordinatuer')
+    assert explanations[2] == []
+    print(f"✓ Explained {sum(len(m) for m in explanations.values())} matches "
+          f"in {len(sentences)} sentences (phrase, exact, lemma and fuzzy)")
+    print()
+    
+    return True
+
+
+def test_lexicon_mode():
+    """Compare lexicon matching against the spaCy lemma path (speed and recall)"""
+    print()
+    print("=" * 60)
+    print("Lexicon Matching Benchmark")
+    print("=" * 60)
+    print()
+    
+    import time
+    from core.config import OptimizerConfig
+    
+    word_list = [
+        {'french': w, 'english': '', 'pos': ''}
+        for w in ['être', 'avoir', 'aller', 'faire', 'faire attention', 'prendre', 'voir',
+                  'manger', 'un|une', 'beau|belle', 'petit|petite', 'maison', 'chat',
+                  'grand-mère', "aujourd'hui", 'le monde']
+    ]
+    sentences = [
+        "Je suis un étudiant.",
+        "Le monde est beau.",
+        "J'ai une maison et un chat.",
+        "Nous allons faire quelque chose.",
+        "Il fait attention.",
+        "Vas-tu voir ta grand-mère aujourd'hui ?",
+        "Elles ont mangé de belles pommes.",
+        "Nous prenons le train.",
+        "Ils vont au marché.",
+        "Les petites maisons étaient vues de loin.",
+    ] * 200
+    
+    results, timings = {}, {}
+    for mode in ('spacy', 'lexicon'):
+        matcher = WordMatcher([dict(w) for w in word_list],
+                              OptimizerConfig(cache_enabled=False, matching_mode=mode))
+        start_time = time.time()
+        results[mode] = matcher.batch_process_sentences(sentences)
+        timings[mode] = time.time() - start_time
+        print(f"  {mode}: {timings[mode]*1000:.1f}ms for {len(sentences)} sentences")
+    
+    reference = sum(len(found) for found in results['spacy'])
+    shared = sum(len(a & b) for a, b in zip(results['spacy'], results['lexicon']))
+    extra = sum(len(b - a) for a, b in zip(results['spacy'], results['lexicon']))
+    recall = shared / max(reference, 1) * 100
+    speedup = timings['spacy'] / max(timings['lexicon'], 1e-9)
+    
+    assert recall >= 95.0, f"lexicon recall {recall:.1f}% of the spaCy lemma path"
+    assert speedup >= 10, f"lexicon mode is only {speedup:.1f}x the speed of spaCy"
+    print(f"✓ Lexicon mode is {speedup:.0f}x faster, "
+          f"recall {recall:.1f}% of the spaCy lemma path ({extra} extra matches)")
+    print()
+    
+    return True
+
+
 if __name__ == '__main__':
     try:
         # Run basic tests
         success = test_basic_matching()
         
         if success:
-            # Run performance test
+            # Run performance tests
             test_performance()
+            test_fuzzy_performance()
+            test_explain()
+            test_lexicon_mode()
             
             print()
             print("=" * 60)
@@ -6,7 +6,6 @@ from flask import Flask, render_template, request, jsonify, send_file
 from werkzeug.utils import secure_filename
 import os
 import sys
-import csv
 import threading
 import traceback
 
@@ -16,10 +15,18 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.config import OptimizerConfig, MAX_FILE_SIZE, ALLOWED_EXTENSIONS
 from core.optimizer import EnhancedSentenceOptimizer
 from core.sheets import EnhancedSheetsHandler
+from core.nlp import preload_pipelines
+from core.corpus import iter_sentences
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 
+# Load the spaCy model once at import time when requested. Under a pre-forking
+# server (e.g. gunicorn --preload) workers then share the model pages
+# copy-on-write; otherwise the first job loads it and later jobs reuse it.
+if os.environ.get('PRELOAD_SPACY_MODELS') == '1':
+    preload_pipelines([OptimizerConfig()])
+
 # Create folders
 os.makedirs('uploads', exist_ok=True)
 os.makedirs('output', exist_ok=True)
@@ -71,6 +78,7 @@ def optimize():
         max_sentences = int(request.form.get('max_sentences', 600))
         algorithm = request.form.get('algorithm', 'weighted_greedy')
         strictness = request.form.get('strictness', 'normal')
+        time_budget = float(request.form.get('time_budget', 0))  # Seconds, 0 = no limit
         
         # Get uploaded file
         if 'sentence_file' not in request.files:
@@ -98,8 +106,9 @@ def optimize():
                 # Configure
                 config = OptimizerConfig(
                     max_sentences=max_sentences,
+                    time_budget=time_budget,
                     parallel_processing=True,
-                    enable_caching=True,
+                    cache_enabled=True,
                     lemma_matching=(strictness != 'exact'),
                     exact_match=(strictness == 'exact')
                 )
@@ -111,16 +120,7 @@ def optimize():
                 
                 # Load sentences
                 current_progress['stage'] = 'Loading sentences...'
-                sentences = []
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    if filename.endswith('.csv') or filename.endswith('.tsv'):
-                        delimiter = '\t' if filename.endswith('.tsv') else ','
-                        reader = csv.reader(f, delimiter=delimiter)
-                        for row in reader:
-                            if row and row[0].strip():
-                                sentences.append(row[0].strip())
-                    else:
-                        sentences = [line.strip() for line in f if line.strip()]
+                sentences = list(iter_sentences(filepath))
                 
                 current_progress['stage'] = f'Loaded {len(sentences)} sentences'
                 
@@ -152,6 +152,7 @@ def optimize():
                     'missing_words': results.missing_words,
                     'processing_time': results.processing_time,
                     'algorithm_used': results.algorithm_used,
+                    'stop_reason': results.stop_reason,
                     'sheet_url': sheet_url
                 }
                 current_progress['complete'] = True